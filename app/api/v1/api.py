@@ -1,7 +1,7 @@
 # Main API router that combines all endpoints
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import todos, auth
+from app.api.v1.endpoints import todos, auth, admin
 
 api_router = APIRouter()
 
@@ -17,4 +17,11 @@ api_router.include_router(
     todos.router, 
     prefix="/todos", 
     tags=["📝 Todos"]
-)
\ No newline at end of file
+)
+
+# Include admin routes (protected diagnostics)
+api_router.include_router(
+    admin.router, 
+    prefix="/admin", 
+    tags=["🛠️ Admin"]
+)
@@ -0,0 +1,63 @@
+# Admin endpoints (database diagnostics)
+from fastapi import APIRouter, HTTPException, Depends
+from app.schemas.user import UserResponse
+from app.core.indexes import get_index_report
+from app.crud.counters import counter_crud
+from app.crud.archive import todo_archiver
+from app.utils.auth import get_current_admin
+
+router = APIRouter()
+
+
+@router.get('/indexes')
+async def get_indexes(current_user: UserResponse = Depends(get_current_admin)):
+    """
+    Report every index per collection with its size and usage counters
+
+    - **ops**: Number of operations that used the index since **since**
+    - **registered**: False for indexes not declared in the index registry
+    - **missing**: True for registered indexes that do not exist yet
+
+    Requires Authentication: Bearer token of a user listed in ADMIN_EMAILS
+    """
+    try:
+        return await get_index_report()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get index report: {str(e)}")
+
+
+@router.post('/counters/rebuild')
+async def rebuild_counters(current_user: UserResponse = Depends(get_current_admin)):
+    """
+    Recompute every user's todo counters from the todos collection
+
+    Repairs drift in the per-user counters behind /todos/stats/count and /todos/stats/summary
+
+    Requires Authentication: Bearer token of a user listed in ADMIN_EMAILS
+    """
+    try:
+        await counter_crud.rebuild()
+        return {"message": "Todo counters rebuilt successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild counters: {str(e)}")
+
+
+@router.get('/archive')
+async def get_archive_stats(current_user: UserResponse = Depends(get_current_admin)):
+    """
+    Get todo archival metrics (runs, documents moved, last run, last error)
+
+    Requires Authentication: Bearer token of a user listed in ADMIN_EMAILS
+    """
+    return todo_archiver.stats()
+
+
+@router.post('/archive/run')
+async def run_archive(current_user: UserResponse = Depends(get_current_admin)):
+    """
+    Archive eligible completed todos now instead of waiting for the next scheduled run
+
+    Requires Authentication: Bearer token of a user listed in ADMIN_EMAILS
+    """
+    moved = await todo_archiver.run_once()
+    return {"moved": moved, **todo_archiver.stats()}
@@ -1,17 +1,37 @@
 # Authentication endpoints (JWT login, register, etc.)
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Form
 from fastapi.security import OAuth2PasswordRequestForm
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, oauth2_scheme
+from app.crud.revoked_token import revoked_token_crud
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.crud.user import user_crud
-from app.core.security import create_access_token
+from app.core.security import create_access_token, decode_access_token_claims, PasswordHasherBusy
 from app.core.config import settings
+from app.utils.rate_limit import login_throttle
 
 
 router = APIRouter()
 
+def _client_ip(request: Request) -> str:
+    """Address the login came from (run behind a proxy with --proxy-headers to see real clients)"""
+    return request.client.host if request.client else "unknown"
+
+def _hasher_busy(e: PasswordHasherBusy) -> HTTPException:
+    """503 telling the client to retry shortly when the password hashing pool is saturated"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"}
+    )
+
+def _issue_token(user) -> str:
+    """Create an access token for an authenticated user (with profile claims in stateless mode)"""
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    claims = user.to_token_claims() if settings.auth_stateless_tokens else None
+    return create_access_token(str(user._id), expires_delta=access_token_expires, claims=claims)
+
 @router.post("/register", response_model=UserResponse)
 async def register_user(user: UserCreate):
     """
@@ -30,6 +50,8 @@ async def register_user(user: UserCreate):
         response_data = created_user.to_response_dict()
         return UserResponse(**response_data)
         
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
     except ValueError as e:
         # Handle duplicate email/username
         raise HTTPException(
@@ -44,7 +66,7 @@ async def register_user(user: UserCreate):
 
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     """
     OAuth2 compatible token endpoint for Swagger UI
     
@@ -55,6 +77,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     """
     try:
         print(f"🔑 OAuth2 login attempt - username: {form_data.username}")
+        await login_throttle.check(_client_ip(request), form_data.username)
         
         # Authenticate user using the username field (which can be email or username)
         user = await user_crud.authenticate_user(
@@ -70,8 +93,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             )
         
         # Create access token
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = create_access_token(str(user._id), expires_delta=access_token_expires)
+        access_token = _issue_token(user)
         
         return {
             "access_token": access_token,
@@ -81,6 +103,8 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         
     except HTTPException:
         raise
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
     except Exception as e:
         print(f"❌ OAuth2 Login error: {e}")
         raise HTTPException(
@@ -90,7 +114,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 
 @router.post("/login", response_model=Token)
-async def login_with_json(user_credentials: UserLogin):
+async def login_with_json(request: Request, user_credentials: UserLogin):
     """
     JSON-based login endpoint for API clients
     
@@ -101,6 +125,7 @@ async def login_with_json(user_credentials: UserLogin):
     """
     try:
         print(f"🔑 JSON login attempt - user: {user_credentials.email_or_username}")
+        await login_throttle.check(_client_ip(request), user_credentials.email_or_username)
         
         # Authenticate user
         user = await user_crud.authenticate_user(
@@ -115,8 +140,7 @@ async def login_with_json(user_credentials: UserLogin):
             )
         
         # Create access token
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = create_access_token(str(user._id), expires_delta=access_token_expires)
+        access_token = _issue_token(user)
         
         return Token(
             access_token=access_token,
@@ -126,6 +150,8 @@ async def login_with_json(user_credentials: UserLogin):
         
     except HTTPException:
         raise
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
     except Exception as e:
         print(f"❌ JSON Login error: {e}")
         raise HTTPException(
@@ -133,6 +159,38 @@ async def login_with_json(user_credentials: UserLogin):
             detail=f"Login failed: {str(e)}"
         )
 
+@router.post("/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Log out by revoking the bearer token used for this request
+    
+    The worker handling this request rejects the token immediately, other workers
+    start rejecting it within REVOCATION_SYNC_SECONDS, on their next filter sync.
+    Other tokens of the user stay valid.
+    """
+    claims = decode_access_token_claims(token)
+    if not claims or "jti" not in claims:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked, it expires on its own"
+        )
+    
+    try:
+        await revoked_token_crud.revoke(claims["jti"], datetime.utcfromtimestamp(claims["exp"]))
+        print(f"🚪 User {current_user.username} logged out")
+        return {"message": "Logged out successfully"}
+        
+    except Exception as e:
+        print(f"❌ Logout error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Logout failed: {str(e)}"
+        )
+
+
 @router.get("/get_current_user", response_model=UserResponse)
 async def read_users_me(current_user: UserResponse = Depends(get_current_user)):
     """
@@ -1,23 +1,97 @@
 # Todo API endpoints with MongoDB CRUD operations and authentication
+import csv
+import io
+import json
+import os
+import tempfile
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response, UploadFile, File, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
 
 # Import schemas and CRUD operations
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse, PriorityLevel, TodoStatus
+from app.schemas.todo import (
+    TodoCreate, TodoUpdate, TodoResponse, TodoPartialResponse, TodoPage, PriorityLevel, TodoStatus,
+    TodoSearchResult, TodoSearchPage, TodoChanges,
+    TODO_RESPONSE_FIELDS,
+    TodoBulkCreate, TodoBulkUpdate, TodoBulkDelete, TodoBulkResponse, TodoStatsSummary
+)
 from app.schemas.user import UserResponse
 from app.crud.todo import todo_crud
+from app.crud.counters import counter_crud
 from app.utils.auth import get_current_user
+from app.core.config import settings
+from app.core.events import event_bus
+from app.utils.todo_import import start_import, get_import_job
+from app.utils.helpers import (
+    make_etag, todo_etag, parse_todo_etag, etag_matches, encode_sync_token, decode_sync_token
+)
 
 router = APIRouter()
 
 
-@router.get('/', response_model=List[TodoResponse])
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ?fields= value into a validated field list"""
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in TODO_RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(TODO_RESPONSE_FIELDS)}"
+        )
+    return requested
+
+
+def _to_response(todo, fields: Optional[List[str]] = None) -> Union[TodoResponse, TodoPartialResponse]:
+    """Convert TodoModel to the full or the reduced response schema"""
+    if fields is None:
+        return TodoResponse(**todo.to_response_dict())
+    return TodoPartialResponse(**todo.to_response_dict(fields))
+
+
+def _not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _parse_if_match(if_match: Optional[str]) -> Optional[List[datetime]]:
+    """Turn an If-Match header (one ETag or a comma-separated list) into accepted updated_at values (None = no condition)"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    # Entries that are not todo ETags can never match, they are simply ignored
+    expected = [parse_todo_etag(candidate) for candidate in if_match.split(",")]
+    expected = [updated_at for updated_at in expected if updated_at is not None]
+    if not expected:
+        raise HTTPException(status_code=412, detail="Precondition failed: unrecognized ETag")
+    return expected
+
+
+async def _missing_or_conflict(todo_id: str, user_id: str, conditional: bool):
+    """Explain a failed conditional write: 412 if the todo still exists, else 404"""
+    if conditional and await todo_crud.get_todo_updated_at(todo_id, user_id) is not None:
+        raise HTTPException(status_code=412, detail="Precondition failed: todo was modified")
+    raise HTTPException(status_code=404, detail="Todo not found")
+
+
+@router.get(
+    '/',
+    response_model=Union[List[TodoResponse], List[TodoPartialResponse], TodoPage],
+    response_model_exclude_unset=True
+)
 async def get_todos(
+    response: Response,
     limit: int = Query(100, description="Maximum number of todos to return"),
     skip: int = Query(0, description="Number of todos to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor pagination: pass an empty value for the first page, then next_cursor"),
     status: Optional[TodoStatus] = Query(None, description="Filter by status"),
     priority: Optional[PriorityLevel] = Query(None, description="Filter by priority"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,status"),
+    include_archived: bool = Query(False, description="Also return archived completed todos"),
+    if_none_match: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -25,48 +99,421 @@ async def get_todos(
     
     - **limit**: Maximum number of todos to return (default: 100)
     - **skip**: Number of todos to skip for pagination (default: 0)
+    - **cursor**: Switches to cursor pagination and returns `{items, next_cursor}` (optional)
     - **status**: Filter todos by status (optional)
     - **priority**: Filter todos by priority (optional)
+    - **fields**: Only load and return these fields; `id` is always included (optional)
+    - **include_archived**: Include completed todos moved to the archive (default: false)
+    
+    Cursor pagination seeks via the index, so deep pages cost the same as the first one
+    and concurrent inserts never shift items between pages.
+    
+    Responses carry an ETag derived from the user's change version; sending it back in
+    If-None-Match returns 304 Not Modified without querying the todos.
     
     Requires Authentication: Bearer token in Authorization header
     """
+    requested_fields = _parse_fields(fields)
     try:
+        version = await counter_crud.get_version(current_user.id)
+        etag = make_etag(current_user.id, version, limit, skip, cursor, status, priority, fields, include_archived)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        if cursor is not None:
+            todos, next_cursor = await todo_crud.get_todos_page(
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit,
+                status_filter=status,
+                priority_filter=priority,
+                fields=requested_fields,
+                include_archived=include_archived,
+                version=version
+            )
+            # Only a successful read gets the ETag, an error response must not be cacheable under it
+            response.headers["ETag"] = etag
+            return TodoPage(
+                items=[_to_response(todo, requested_fields) for todo in todos],
+                next_cursor=next_cursor
+            )
+        
         todos = await todo_crud.get_todos(
             user_id=current_user.id,
             skip=skip,
             limit=limit,
             status_filter=status,
-            priority_filter=priority
+            priority_filter=priority,
+            fields=requested_fields,
+            include_archived=include_archived,
+            # Same version as the ETag, so the body can never be older than its ETag
+            version=version
         )
+        response.headers["ETag"] = etag
         
-        # Convert TodoModel to TodoResponse format
-        response_todos = []
-        for todo in todos:
-            response_data = todo.to_response_dict()
-            response_todos.append(TodoResponse(**response_data))
-        
-        return response_todos
+        # Convert TodoModel to TodoResponse (or reduced) format
+        return [_to_response(todo, requested_fields) for todo in todos]
+    except ValueError as e:
+        # Malformed cursor
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch todos: {str(e)}")
 
 
-@router.get('/{todo_id}', response_model=TodoResponse)
-async def get_todo(todo_id: str, current_user: UserResponse = Depends(get_current_user)):
+@router.get('/search', response_model=TodoSearchPage)
+async def search_todos(
+    q: str = Query(..., min_length=1, description="Words or \"phrases\" to search for in name and description"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+    status: Optional[TodoStatus] = Query(None, description="Filter by status"),
+    priority: Optional[PriorityLevel] = Query(None, description="Filter by priority"),
+    include_archived: bool = Query(False, description="Also search archived completed todos"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Search the current user's todos by name and description, most relevant first
+    
+    - **q**: Search terms (name matches weigh more than description matches)
+    - **limit**: Maximum number of results to return (default: 20)
+    - **cursor**: Cursor from a previous page's next_cursor (optional)
+    - **status**: Filter results by status (optional)
+    - **priority**: Filter results by priority (optional)
+    - **include_archived**: Include completed todos moved to the archive (default: false)
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    try:
+        hits, next_cursor = await todo_crud.search_todos(
+            q,
+            user_id=current_user.id,
+            cursor=cursor,
+            limit=limit,
+            status_filter=status,
+            priority_filter=priority,
+            include_archived=include_archived
+        )
+        return TodoSearchPage(
+            items=[TodoSearchResult(**todo.to_response_dict(), score=score) for todo, score in hits],
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        # Malformed cursor
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search todos: {str(e)}")
+
+
+@router.get('/changes', response_model=TodoChanges)
+async def get_todo_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous sync (omit for a full sync)"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Get todos created/updated and IDs deleted since the previous sync
+    
+    - **since**: Token returned as next_token by the previous call (optional)
+    
+    Returns 410 Gone when the token is older than the deletion history or the delta is
+    too large; the client should then sync again without since. A sync without since
+    always returns every todo and is never answered with 410.
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    try:
+        since_at = decode_sync_token(since) if since else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    now = datetime.utcnow()
+    if since_at is not None:
+        if since_at < now - timedelta(days=settings.tombstone_ttl_days):
+            raise HTTPException(status_code=410, detail="Sync token expired, full resync required")
+        # Overlap windows so writes stamped just before the last sync but committed after it are not missed
+        since_at -= timedelta(seconds=settings.sync_clock_skew_seconds)
+    
+    try:
+        changes = await todo_crud.get_changes(current_user.id, since_at, now, settings.sync_max_changes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get todo changes: {str(e)}")
+    
+    if changes is None:
+        raise HTTPException(status_code=410, detail="Too many changes, full resync required")
+    
+    todos, deleted = changes
+    return TodoChanges(
+        changed=[TodoResponse(**todo.to_response_dict()) for todo in todos],
+        deleted=deleted,
+        next_token=encode_sync_token(now)
+    )
+
+
+@router.get('/events')
+async def todo_events(request: Request, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Stream create/update/delete events for the current user's todos (Server-Sent Events)
+    
+    Each event is `event: created|updated|deleted` with the todo as JSON data.
+    Deleted events carry only the `id`, bulk updates only `id` and the changed fields.
+    A client that falls too far behind receives `event: resync` and should refetch its list.
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    subscription = event_bus.subscribe(current_user.id)
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    yield "event: resync\ndata: {}\n\n"
+                    break
+                event = await subscription.get(timeout=settings.event_keepalive_seconds)
+                if event is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(jsonable_encoder(event["todo"]))
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Column order of exported todos
+EXPORT_FIELDS = ["id", "name", "description", "priority", "status", "created_at", "updated_at"]
+
+
+def _export_row(todo) -> dict:
+    """Flatten a TodoModel into JSON/CSV friendly values"""
+    data = todo.to_response_dict()
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "description": data["description"],
+        "priority": data["priority"].value,
+        "status": data["status"].value,
+        "created_at": data["created_at"].isoformat() if data["created_at"] else None,
+        "updated_at": data["updated_at"].isoformat() if data["updated_at"] else None
+    }
+
+
+async def _ndjson_lines(user_id: str):
+    """Yield one JSON document per line"""
+    async for todo in todo_crud.iter_todos(user_id):
+        yield json.dumps(_export_row(todo)) + "\n"
+
+
+async def _csv_lines(user_id: str):
+    """Yield a CSV header followed by one row per todo"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    async for todo in todo_crud.iter_todos(user_id):
+        writer.writerow(_export_row(todo))
+        # Only ever hold the current row in memory
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get('/export')
+async def export_todos(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Export all todos of the current authenticated user as a streamed download
+    
+    - **format**: `ndjson` (one JSON object per line, default) or `csv`
+    
+    Rows are streamed from the database cursor, so memory use does not grow with the number of todos
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    if format == "csv":
+        body, media_type = _csv_lines(current_user.id), "text/csv"
+    else:
+        body, media_type = _ndjson_lines(current_user.id), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'}
+    )
+
+
+@router.post('/import', status_code=202)
+async def import_todos(
+    file: UploadFile = File(..., description="NDJSON or CSV file with name, description, priority, status"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="File format (default: from the file name)"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Import todos for the current authenticated user from an uploaded file
+    
+    - **file**: NDJSON (one todo object per line) or CSV (header row with the same field names)
+    - **format**: `ndjson` or `csv`; guessed from the file extension when omitted
+    
+    Rows are validated like a single create and inserted in batches in the background.
+    Poll `GET /todos/import/{job_id}` for progress.
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    file_format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    
+    # Copy the upload in chunks so the background job owns a file that outlives this request
+    handle, path = tempfile.mkstemp(prefix="todo_import_", suffix=f".{file_format}")
+    try:
+        with os.fdopen(handle, "wb") as target:
+            while chunk := await file.read(1024 * 1024):
+                target.write(chunk)
+    except Exception as e:
+        os.unlink(path)
+        raise HTTPException(status_code=500, detail=f"Failed to read upload: {str(e)}")
+    
+    try:
+        job = await start_import(current_user.id, path, file_format)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start import: {str(e)}")
+    return job.to_dict()
+
+
+@router.get('/import/{job_id}')
+async def get_import_status(job_id: str, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Get progress of an import started by the current user
+    
+    - **status**: pending, running, completed or failed
+    - **processed** / **inserted** / **failed**: Row counters so far
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    try:
+        job = await get_import_job(job_id, current_user.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get import job: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+
+def _check_batch_size(count: int):
+    """Reject bulk requests larger than the configured batch size"""
+    if count > settings.max_bulk_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {count} items (max {settings.max_bulk_batch_size})"
+        )
+
+
+def _bulk_response(results: list) -> TodoBulkResponse:
+    """Summarize per-item bulk results"""
+    succeeded = sum(1 for result in results if result["success"])
+    return TodoBulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post('/bulk', response_model=TodoBulkResponse)
+async def bulk_create_todos(bulk: TodoBulkCreate, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Create many todos for the current authenticated user in one request
+    
+    - **items**: Todos to create (same fields as a single create)
+    - **ordered**: Stop at the first failure (default: false, attempt every item)
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    _check_batch_size(len(bulk.items))
+    try:
+        results = await todo_crud.bulk_create_todos(bulk.items, current_user.id, ordered=bulk.ordered)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create todos: {str(e)}")
+
+
+@router.patch('/bulk', response_model=TodoBulkResponse)
+async def bulk_update_todos(bulk: TodoBulkUpdate, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Update many todos owned by the current user in one request
+    
+    - **items**: Partial updates, each with the **id** of the todo to update
+    - **ordered**: Stop at the first failure (default: false, attempt every item)
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    _check_batch_size(len(bulk.items))
+    try:
+        results = await todo_crud.bulk_update_todos(bulk.items, current_user.id, ordered=bulk.ordered)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update todos: {str(e)}")
+
+
+@router.delete('/bulk', response_model=TodoBulkResponse)
+async def bulk_delete_todos(bulk: TodoBulkDelete, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Delete many todos owned by the current user in one request
+    
+    - **ids**: IDs of the todos to delete
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    _check_batch_size(len(bulk.ids))
+    try:
+        results = await todo_crud.bulk_delete_todos(bulk.ids, current_user.id)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete todos: {str(e)}")
+
+
+@router.get(
+    '/{todo_id}',
+    response_model=Union[TodoResponse, TodoPartialResponse],
+    response_model_exclude_unset=True
+)
+async def get_todo(
+    todo_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,status"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user)
+):
     """
     Get a specific todo by ID (only returns todos owned by the current user)
     
     - **todo_id**: The ID of the todo to retrieve (MongoDB ObjectId string)
+    - **fields**: Only load and return these fields; `id` is always included (optional)
+    
+    The ETag changes whenever the todo is modified; send it in If-None-Match for a 304,
+    or in If-Match on PUT/DELETE to avoid overwriting someone else's change.
     
     Requires Authentication: Bearer token in Authorization header
     """
+    requested_fields = _parse_fields(fields)
+    variant = ",".join(requested_fields) if requested_fields is not None else ""
     try:
-        todo = await todo_crud.get_todo(todo_id, current_user.id)
+        # Cheap projected read: answers a revalidation and keys the cache on the current version
+        updated_at = await todo_crud.get_todo_updated_at(todo_id, current_user.id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        etag = todo_etag(updated_at, variant)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        todo = await todo_crud.get_todo(todo_id, current_user.id, fields=requested_fields, updated_at=updated_at)
         if not todo:
             raise HTTPException(status_code=404, detail="Todo not found")
         
-        # Convert TodoModel to TodoResponse format
-        response_data = todo.to_response_dict()
-        return TodoResponse(**response_data)
+        response.headers["ETag"] = todo_etag(todo.updated_at, variant)
+        
+        # Convert TodoModel to TodoResponse (or reduced) format
+        return _to_response(todo, requested_fields)
     except HTTPException:
         raise
     except Exception as e:
@@ -98,6 +545,8 @@ async def create_todo(todo: TodoCreate, current_user: UserResponse = Depends(get
 async def update_todo(
     todo_id: str, 
     todo_update: TodoUpdate, 
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -105,13 +554,19 @@ async def update_todo(
     
     - **todo_id**: The ID of the todo to update (MongoDB ObjectId string)
     - **todo_update**: Updated todo data (all fields optional)
+    - **If-Match** header: Only update if the todo still has this ETag, otherwise 412 (optional)
     
     Requires Authentication: Bearer token in Authorization header
     """
+    expected_updated_at = _parse_if_match(if_match)
     try:
-        updated_todo = await todo_crud.update_todo(todo_id, todo_update, current_user.id)
+        updated_todo = await todo_crud.update_todo(
+            todo_id, todo_update, current_user.id, expected_updated_at=expected_updated_at
+        )
         if not updated_todo:
-            raise HTTPException(status_code=404, detail="Todo not found")
+            await _missing_or_conflict(todo_id, current_user.id, expected_updated_at is not None)
+        
+        response.headers["ETag"] = todo_etag(updated_todo.updated_at)
         
         # Convert TodoModel to TodoResponse format
         response_data = updated_todo.to_response_dict()
@@ -123,18 +578,24 @@ async def update_todo(
 
 
 @router.delete('/{todo_id}')
-async def delete_todo(todo_id: str, current_user: UserResponse = Depends(get_current_user)):
+async def delete_todo(
+    todo_id: str,
+    if_match: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user)
+):
     """
     Delete a todo by ID (only for todos owned by the current user)
     
     - **todo_id**: The ID of the todo to delete (MongoDB ObjectId string)
+    - **If-Match** header: Only delete if the todo still has this ETag, otherwise 412 (optional)
     
     Requires Authentication: Bearer token in Authorization header
     """
+    expected_updated_at = _parse_if_match(if_match)
     try:
-        deleted = await todo_crud.delete_todo(todo_id, current_user.id)
+        deleted = await todo_crud.delete_todo(todo_id, current_user.id, expected_updated_at=expected_updated_at)
         if not deleted:
-            raise HTTPException(status_code=404, detail="Todo not found")
+            await _missing_or_conflict(todo_id, current_user.id, expected_updated_at is not None)
         
         return {"message": "Todo deleted successfully", "deleted_id": todo_id}
     except HTTPException:
@@ -158,4 +619,21 @@ async def get_todos_count(current_user: UserResponse = Depends(get_current_user)
             "username": current_user.username
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get todos count: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get todos count: {str(e)}")
+
+
+@router.get('/stats/summary', response_model=TodoStatsSummary)
+async def get_todos_summary(current_user: UserResponse = Depends(get_current_user)):
+    """
+    Get todo statistics for the current authenticated user
+    
+    Returns the total, counts by status, counts by priority and the
+    status x priority matrix from the user's counters document (one point read)
+    
+    Requires Authentication: Bearer token in Authorization header
+    """
+    try:
+        summary = await todo_crud.get_todos_summary(current_user.id)
+        return TodoStatsSummary(**summary)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get todos summary: {str(e)}")
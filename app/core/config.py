@@ -17,14 +17,72 @@ class Settings(BaseSettings):
     # 🗄️ Database Configuration
     mongodb_url: str
     database_name: str
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 10  # Connections pre-opened during startup warm-up
+    mongodb_max_idle_time_ms: int = 300000
+    mongodb_wait_queue_timeout_ms: int = 2000  # Fail fast instead of queueing forever when the pool is exhausted
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_connect_timeout_ms: int = 5000
+    mongodb_compressors: str = "zstd,snappy,zlib"  # Wire compression, in order of preference
     
     # 🔒 Security Configuration
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    admin_emails: List[str] = []  # Users allowed to call /admin endpoints (none by default)
+    auth_stateless_tokens: bool = False  # Tokens carry the profile, get_current_user only checks the token version
+    token_cache_enabled: bool = True  # Remember verified tokens until they expire instead of re-checking the signature
+    token_cache_max_entries: int = 10000
+    password_hash_scheme: str = "bcrypt"  # Scheme for new hashes, older schemes still verify and get upgraded on login
+    password_hash_rounds: int = 12  # Cost of the scheme (log2 rounds for bcrypt), existing hashes at another cost are upgraded on login
+    password_hash_workers: int = 4  # Threads running bcrypt off the event loop
+    password_hash_queue_limit: int = 64  # Hashes allowed to wait for a thread before logins get 503
+    
+    # 🚦 Login Throttling Configuration (token buckets, checked before any password is verified)
+    login_throttle_enabled: bool = True
+    login_throttle_store: str = "memory"  # "memory" (per process) or "mongo" (shared by every worker)
+    login_ip_per_minute: float = 20
+    login_ip_burst: int = 10
+    login_account_per_minute: float = 5
+    login_account_burst: int = 5
+    
+    # 🚪 Logout / Token Revocation Configuration
+    revocation_sync_seconds: int = 30  # How long another worker may still accept a token revoked elsewhere
+    revocation_bloom_capacity: int = 100000  # Grown automatically on sync when more tokens are revoked
+    revocation_bloom_error_rate: float = 0.01  # Share of valid tokens that still need a database check
     
     # 🌐 API Configuration
     api_v1_str: str = "/api/v1"
+    max_bulk_batch_size: int = 1000  # Max items per bulk create/update/delete request
+    import_batch_size: int = 1000  # Rows per insert_many while importing uploads
+    import_job_ttl_days: int = 7  # Import progress records are removed this long after the import started
+    
+    # ⚡ Todo Read Cache Configuration (per process)
+    todo_cache_enabled: bool = True
+    todo_cache_ttl_seconds: int = 30
+    todo_cache_max_entries: int = 10000
+    todo_cache_max_bytes: int = 64 * 1024 * 1024  # Estimated from cached todo sizes
+    
+    # 👤 Authenticated User Cache Configuration (per process)
+    user_cache_enabled: bool = True
+    user_cache_ttl_seconds: int = 60  # Upper bound on how long another process may serve a stale profile
+    user_cache_max_entries: int = 10000
+    
+    # 🗄️ Archival Configuration
+    archive_enabled: bool = True
+    archive_after_days: int = 30  # Completed todos untouched for this long move to todos_archive
+    archive_batch_size: int = 500
+    archive_interval_minutes: int = 60
+    
+    # 🔄 Delta Sync Configuration
+    tombstone_ttl_days: int = 30  # Deleted-todo markers expire after this; older sync tokens force a full resync
+    sync_max_changes: int = 5000  # Larger deltas answer 410 so the client refetches everything instead
+    sync_clock_skew_seconds: int = 5  # Overlap between sync windows to catch late-committed writes
+    
+    # 📡 Change Feed Configuration
+    event_source: str = "local"  # "local" (in-process writes) or "change_stream" (needs a replica set)
+    event_queue_size: int = 100  # Buffered events per connection before a slow client is cut off
+    event_keepalive_seconds: int = 15
     backend_cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8000", "http://localhost:8080"]
     
     class Config:
@@ -1,23 +1,113 @@
 # Database configuration and connection
+import asyncio
 import datetime
-from pymongo import MongoClient
+import threading
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import monitoring
 from bson.objectid import ObjectId
 from typing import Optional
 from app.core.config import settings
 
-# Global MongoDB client
-client: Optional[MongoClient] = None
-database = None
 
-def connect_to_mongo():
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects live connection pool statistics from pymongo's CMAP events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.check_out_failed = 0
+        self.pools_cleared = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.check_out_failed += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> dict:
+        """Return a consistent copy of the current counters"""
+        with self._lock:
+            return {
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "open": self.created - self.closed,
+                "created": self.created,
+                "closed": self.closed,
+                "check_out_failed": self.check_out_failed,
+                "pools_cleared": self.pools_cleared,
+                "max_pool_size": settings.mongodb_max_pool_size,
+                "min_pool_size": settings.mongodb_min_pool_size,
+            }
+
+
+# Global MongoDB client (motor - non-blocking, runs on the event loop)
+client: Optional[AsyncIOMotorClient] = None
+database: Optional[AsyncIOMotorDatabase] = None
+pool_stats = PoolStatsListener()
+
+def _create_client() -> AsyncIOMotorClient:
+    """Build the async MongoDB client (no I/O happens until first operation)"""
+    compressors = [c.strip() for c in settings.mongodb_compressors.split(",") if c.strip()]
+    return AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
+        serverSelectionTimeoutMS=settings.mongodb_server_selection_timeout_ms,
+        connectTimeoutMS=settings.mongodb_connect_timeout_ms,
+        compressors=compressors or None,
+        event_listeners=[pool_stats],
+    )
+
+async def connect_to_mongo():
     """Initialize MongoDB connection using environment variables"""
     global client, database
     try:
         print(f"🔌 Connecting to MongoDB: {settings.database_name}")
-        client = MongoClient(settings.mongodb_url)
+        client = _create_client()
         database = client[settings.database_name]
         # Test the connection
-        client.admin.command('ping')
+        await client.admin.command('ping')
         print(f"✅ Connected to MongoDB successfully! Database: {settings.database_name}")
         return database
     except Exception as e:
@@ -25,21 +115,41 @@ def connect_to_mongo():
         print(f"🔍 Check your .env file and MongoDB Atlas network access")
         raise
 
-def get_database():
+async def warm_up_pool():
+    """Pre-open the minimum pool so the first requests don't pay for TCP/TLS handshakes"""
+    if client is None or settings.mongodb_min_pool_size <= 0:
+        return
+    # Concurrent pings force the pool to open one connection per in-flight command
+    await asyncio.gather(*[
+        client.admin.command('ping') for _ in range(settings.mongodb_min_pool_size)
+    ])
+    stats = pool_stats.snapshot()
+    print(f"🔥 MongoDB pool warmed up: {stats['open']} open connection(s)")
+
+def get_pool_stats() -> dict:
+    """Get live connection pool statistics"""
+    return pool_stats.snapshot()
+
+def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
-    global database
+    global client, database
     if database is None:
-        database = connect_to_mongo()
+        # Motor connects lazily, so building the client here never blocks the loop
+        print("⚠️ MongoDB client not initialized at startup - creating it on demand")
+        client = _create_client()
+        database = client[settings.database_name]
     return database
 
-def get_collection(collection_name: str):
+def get_collection(collection_name: str) -> AsyncIOMotorCollection:
     """Get a specific collection from the database"""
     db = get_database()
     return db[collection_name]
 
 def close_connection():
     """Close MongoDB connection"""
-    global client
+    global client, database
     if client:
         client.close()
-        print("📴 MongoDB connection closed")
\ No newline at end of file
+        client = None
+        database = None
+        print("📴 MongoDB connection closed")
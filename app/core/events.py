@@ -0,0 +1,157 @@
+# In-process publish/subscribe bus for per-user todo change events
+import asyncio
+from typing import Dict, Optional, Set
+from app.core.config import settings
+
+
+class Subscription:
+    """One listener's bounded event queue"""
+
+    def __init__(self, user_id: str, max_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Wait for the next event, None when nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Fans todo changes out to every subscription of the affected user"""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Register a new listener for a user's events"""
+        subscription = Subscription(user_id, self.max_queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a listener"""
+        listeners = self._subscriptions.get(subscription.user_id)
+        if listeners:
+            listeners.discard(subscription)
+            if not listeners:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: str, event: dict):
+        """Deliver an event without ever blocking the writer"""
+        self.published += 1
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow consumer is cut off and told to resync instead of growing memory
+                self.dropped += 1
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Current bus statistics"""
+        return {
+            "users": len(self._subscriptions),
+            "subscriptions": sum(len(listeners) for listeners in self._subscriptions.values()),
+            "published": self.published,
+            "dropped_subscriptions": self.dropped,
+            "source": "change_stream" if settings.event_source != "local" and change_stream_active else "local",
+        }
+
+
+# 🎯 Global event bus instance
+event_bus = EventBus(max_queue_size=settings.event_queue_size)
+
+# True while watch_todo_changes has an open change stream feeding the bus
+change_stream_active = False
+
+# True once todos records pre-images, the only way a delete event can name the owner
+pre_images_enabled = False
+
+
+def publish_todo_event(event_type: str, user_id: str, todo: dict, streamed: bool = True):
+    """
+    Publish a todo change from a local write (skipped while the change stream feeds the bus)
+    
+    streamed=False marks writes the stream never sees (e.g. deleting an archived todo), those are
+    always published here. So are deletes while pre-images are off.
+    """
+    if (
+        streamed
+        and settings.event_source != "local"
+        and change_stream_active
+        and (event_type != "deleted" or pre_images_enabled)
+    ):
+        return
+    event_bus.publish(user_id, {"type": event_type, "todo": todo})
+
+
+async def enable_pre_images(collection):
+    """Record pre-images on the watched collection (MongoDB 6.0+) so deletes reach the stream"""
+    global pre_images_enabled
+    await collection.database.command(
+        "collMod", collection.name, changeStreamPreAndPostImages={"enabled": True}
+    )
+    pre_images_enabled = True
+    print(f"📸 Change stream pre-images enabled on {collection.name}")
+
+
+async def watch_todo_changes(collection, archive_collection):
+    """
+    Feed the bus from a MongoDB change stream (requires a replica set)
+    
+    Reconnects with exponential backoff and resumes after the last seen event.
+    While the stream is down, local writes are published directly instead, so
+    clients connected to this process keep receiving their own changes.
+    
+    Deletes that only move a todo into archive_collection are skipped, like in local mode.
+    """
+    global change_stream_active
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+    types = {"insert": "created", "update": "updated", "replace": "updated", "delete": "deleted"}
+    resume_token = None
+    delay = 1
+    while True:
+        try:
+            async with collection.watch(
+                pipeline,
+                full_document="updateLookup",
+                full_document_before_change="whenAvailable",
+                resume_after=resume_token
+            ) as stream:
+                change_stream_active = True
+                delay = 1
+                print("📡 Watching todos change stream")
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    doc = change.get("fullDocument") or change.get("fullDocumentBeforeChange")
+                    if not doc:
+                        # Without pre-images a delete names no owner, those are published locally
+                        continue
+                    if change["operationType"] == "delete" and await archive_collection.find_one(
+                        {"_id": doc["_id"]}, {"_id": 1}
+                    ):
+                        # The archiver copies before it deletes, so a copy means the todo was archived
+                        continue
+                    todo = {"id": str(doc["_id"])}
+                    if change["operationType"] != "delete":
+                        todo.update({key: value for key, value in doc.items() if key not in ("_id", "user_id")})
+                    event_bus.publish(doc.get("user_id"), {"type": types[change["operationType"]], "todo": todo})
+        except asyncio.CancelledError:
+            change_stream_active = False
+            raise
+        except Exception as e:
+            change_stream_active = False
+            print(f"❌ Todo change stream stopped, publishing local writes and retrying in {delay}s: {e}")
+            # A token the server no longer knows would fail forever - start from now instead
+            if resume_token is not None and "resume" in str(e).lower():
+                resume_token = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
@@ -0,0 +1,184 @@
+# Declarative MongoDB index registry, reconciled at startup
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from app.core.database import get_collection
+from app.core.config import settings
+
+# Every index the application relies on, keyed by collection name.
+# Names are explicit so reconciliation and usage reports are stable across deploys.
+# Todo list indexes end with _id so keyset pagination on (created_at, _id) is fully index-backed.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "todos": [
+        # get_todos (no filter) / get_todos_count
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_created_at",
+        ),
+        # get_todos filtered by status
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_status_created_at",
+        ),
+        # get_todos filtered by priority
+        IndexModel(
+            [("user_id", ASCENDING), ("priority", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_priority_created_at",
+        ),
+        # get_changes (delta sync)
+        IndexModel(
+            [("user_id", ASCENDING), ("updated_at", ASCENDING)],
+            name="user_updated_at",
+        ),
+        # search_todos - user_id prefix keeps each text search inside one user's todos
+        IndexModel(
+            [("user_id", ASCENDING), ("name", TEXT), ("description", TEXT)],
+            name="user_text_search",
+            weights={"name": 3, "description": 1},
+        ),
+        # TodoArchiver - completed todos by age
+        IndexModel(
+            [("status", ASCENDING), ("updated_at", ASCENDING)],
+            name="status_updated_at",
+        ),
+    ],
+    # Only read through include_archived lists and searches
+    "todos_archive": [
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_created_at",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("name", TEXT), ("description", TEXT)],
+            name="user_text_search",
+            weights={"name": 3, "description": 1},
+        ),
+    ],
+    "todo_tombstones": [
+        IndexModel(
+            [("user_id", ASCENDING), ("deleted_at", ASCENDING)],
+            name="user_deleted_at",
+        ),
+        # TTL: Mongo removes tombstones once no valid sync token can still need them
+        IndexModel(
+            [("deleted_at", ASCENDING)],
+            name="deleted_at_ttl",
+            expireAfterSeconds=settings.tombstone_ttl_days * 24 * 3600,
+        ),
+    ],
+    # Background import progress, polled by any worker
+    "import_jobs": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=settings.import_job_ttl_days * 24 * 3600,
+        ),
+    ],
+    # LoginThrottle buckets (MongoBucketStore) - a bucket that would be full again is deleted
+    "login_buckets": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    # Logout - a revoked token id is only needed until the token would have expired anyway
+    "revoked_tokens": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+}
+
+
+def _same_keys(info: dict, index: IndexModel) -> bool:
+    """Compare an existing index (index_information entry) with its registered spec"""
+    # A TTL index and a plain one on the same keys are different indexes (collMod cannot convert)
+    if ("expireAfterSeconds" in info) != ("expireAfterSeconds" in index.document):
+        return False
+    wanted = list(index.document["key"].items())
+    if not any(direction == TEXT for _, direction in wanted):
+        return list(info["key"]) == wanted
+    # Text indexes are stored as _fts/_ftsx keys, the text fields live in "weights"
+    plain = [(field, direction) for field, direction in info["key"] if field not in ("_fts", "_ftsx")]
+    return (
+        plain == [(field, direction) for field, direction in wanted if direction != TEXT]
+        and set(info.get("weights", {})) == {field for field, direction in wanted if direction == TEXT}
+    )
+
+
+async def ensure_indexes():
+    """Create any registered index that is missing and report unmanaged ones"""
+    for collection_name, indexes in INDEX_REGISTRY.items():
+        collection = get_collection(collection_name)
+        wanted = {index.document["name"] for index in indexes}
+
+        existing = await collection.index_information()
+
+        # A registered name whose keys changed is dropped and rebuilt
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing and not _same_keys(existing[name], index):
+                await collection.drop_index(name)
+                del existing[name]
+                print(f"♻️ Dropped outdated index {collection_name}.{name}")
+
+        # A changed TTL (e.g. TOMBSTONE_TTL_DAYS) is applied in place, without rebuilding the index
+        for index in indexes:
+            name = index.document["name"]
+            ttl = index.document.get("expireAfterSeconds")
+            if name in existing and ttl is not None and existing[name].get("expireAfterSeconds") != ttl:
+                await collection.database.command(
+                    "collMod", collection_name, index={"name": name, "expireAfterSeconds": ttl}
+                )
+                print(f"⏳ Changed TTL of {collection_name}.{name} to {ttl}s")
+
+        missing = [index for index in indexes if index.document["name"] not in existing]
+
+        for index in missing:
+            try:
+                await collection.create_indexes([index])
+                print(f"📇 Created index {collection_name}.{index.document['name']}")
+            except OperationFailure as e:
+                # e.g. duplicate data blocking a unique index, or same keys under another name
+                print(f"❌ Could not create index {collection_name}.{index.document['name']}: {e}")
+
+        unmanaged = [name for name in existing if name != "_id_" and name not in wanted]
+        for name in unmanaged:
+            print(f"⚠️ Index {collection_name}.{name} is not in the registry")
+
+    print("✅ Indexes reconciled")
+
+
+async def get_index_report() -> Dict[str, list]:
+    """Report each index's size and $indexStats usage per registered collection"""
+    report = {}
+    for collection_name, indexes in INDEX_REGISTRY.items():
+        collection = get_collection(collection_name)
+        registered = {index.document["name"] for index in indexes}
+
+        sizes = {}
+        async for stats in collection.aggregate([{"$collStats": {"storageStats": {}}}]):
+            sizes.update(stats.get("storageStats", {}).get("indexSizes", {}))
+
+        existing = await collection.index_information()
+        usage = {}
+        async for stats in collection.aggregate([{"$indexStats": {}}]):
+            usage[stats["name"]] = stats.get("accesses", {})
+
+        entries = []
+        for name, info in existing.items():
+            accesses = usage.get(name, {})
+            entries.append({
+                "name": name,
+                "keys": [[field, direction] for field, direction in info["key"]],
+                "unique": info.get("unique", False),
+                "size_bytes": sizes.get(name),
+                "ops": accesses.get("ops", 0),
+                "since": accesses.get("since"),
+                "registered": name in registered or name == "_id_",
+            })
+
+        for name in registered - set(existing):
+            entries.append({"name": name, "missing": True, "registered": True})
+
+        report[collection_name] = entries
+    return report
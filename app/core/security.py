@@ -1,15 +1,40 @@
 # Security utilities (JWT, password hashing, etc.)
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.utils.cache import ExpiringCache, MISS
+
+def build_password_context(scheme: str, rounds: int) -> CryptContext:
+    """
+    Password hashing context hashing with scheme at exactly the given cost.
+
+    bcrypt stays enabled for verification when another scheme is chosen, and
+    every hash not made with the current scheme and cost is reported by
+    needs_update so it can be upgraded after the next successful login.
+    """
+    schemes = [scheme] if scheme == "bcrypt" else [scheme, "bcrypt"]
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated="auto",
+        **{
+            f"{scheme}__default_rounds": rounds,
+            f"{scheme}__min_rounds": rounds,
+            f"{scheme}__max_rounds": rounds,
+        }
+    )
 
 # Password hashing context with improved configuration
-pwd_context = CryptContext(
-    schemes=["bcrypt"], 
-    deprecated="auto",
-)
+pwd_context = build_password_context(settings.password_hash_scheme, settings.password_hash_rounds)
+
+# Verified token -> payload, each entry dropped at the token's own exp
+token_cache = ExpiringCache(max_entries=settings.token_cache_max_entries)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
@@ -19,8 +44,106 @@ def get_hash_password(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
-def create_access_token(user_id: str, expires_delta: timedelta = None) -> str:
-    """Create JWT access token"""
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with an outdated scheme or cost"""
+    return pwd_context.needs_update(hashed_password)
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool so the event loop keeps serving.
+
+    bcrypt releases the GIL while hashing, so threads run in parallel. At most
+    queue_limit hashes wait for a free thread - beyond that callers are rejected
+    immediately with PasswordHasherBusy instead of queueing without bound.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.pending = 0
+        self.rejected = 0
+        # Per operation: count, total/max time on a thread, total/max time waiting for one
+        self._timings = {
+            op: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "wait_total_ms": 0.0, "wait_max_ms": 0.0}
+            for op in ("hash", "verify")
+        }
+
+    async def _run(self, op: str, fn, *args):
+        if self.pending >= self.max_workers + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress")
+
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return fn(*args), started - submitted, time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        future = self._executor.submit(timed)
+        # Released when the thread finishes, even if the caller was cancelled meanwhile
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        result, waited, elapsed = await asyncio.wrap_future(future)
+        self._record(op, waited, elapsed)
+        return result
+
+    def _release(self):
+        self.pending -= 1
+
+    def _record(self, op: str, waited: float, elapsed: float):
+        timing = self._timings[op]
+        timing["count"] += 1
+        timing["total_ms"] += elapsed * 1000
+        timing["max_ms"] = max(timing["max_ms"], elapsed * 1000)
+        timing["wait_total_ms"] += waited * 1000
+        timing["wait_max_ms"] = max(timing["wait_max_ms"], waited * 1000)
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash off the event loop"""
+        return await self._run("hash", get_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password off the event loop"""
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """Queue depth, rejections and per-operation timings"""
+        timings = {}
+        for op, timing in self._timings.items():
+            count = timing["count"]
+            timings[op] = {
+                "count": count,
+                "avg_ms": round(timing["total_ms"] / count, 2) if count else 0.0,
+                "max_ms": round(timing["max_ms"], 2),
+                "avg_wait_ms": round(timing["wait_total_ms"] / count, 2) if count else 0.0,
+                "max_wait_ms": round(timing["wait_max_ms"], 2),
+            }
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            **timings,
+        }
+
+# 🎯 Global password hasher used by the async CRUD code
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit
+)
+
+def create_access_token(user_id: str, expires_delta: timedelta = None, claims: Optional[dict] = None) -> str:
+    """Create JWT access token (claims are extra payload fields, e.g. the user's profile)"""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -28,21 +151,34 @@ def create_access_token(user_id: str, expires_delta: timedelta = None) -> str:
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode = {"sub": user_id, "exp": expire}
+    # jti identifies the token so logout can revoke it
+    to_encode = {**(claims or {}), "sub": user_id, "exp": expire, "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(
         to_encode, settings.secret_key, algorithm=settings.algorithm
     )
     return encoded_jwt
 
-def decode_access_token(token: str) -> Optional[str]:
-    """Decode JWT access token and return user ID"""
+def decode_access_token_claims(token: str) -> Optional[dict]:
+    """Verify JWT access token and return its whole payload"""
+    if settings.token_cache_enabled:
+        cached = token_cache.get(token)
+        if cached is not MISS:
+            return cached
+    
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             return None
-        return user_id
+        # Only successfully verified tokens are remembered, and never past their exp
+        if settings.token_cache_enabled and "exp" in payload:
+            token_cache.set(token, payload, payload["exp"])
+        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def decode_access_token(token: str) -> Optional[str]:
+    """Decode JWT access token and return user ID"""
+    payload = decode_access_token_claims(token)
+    return payload["sub"] if payload else None
\ No newline at end of file
@@ -0,0 +1,106 @@
+# Background archival of completed todos into a cold collection
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.core.database import get_collection
+from app.crud.counters import counter_crud
+from app.crud.todo import todo_cache
+from app.schemas.todo import TodoStatus
+
+
+class TodoArchiver:
+    """Moves completed todos older than the configured age from todos to todos_archive"""
+
+    def __init__(self):
+        self.collection_name = "todos"
+        self.archive_collection_name = "todos_archive"
+        self.tombstones_collection_name = "todo_tombstones"
+        self.runs = 0
+        self.moved = 0
+        self.last_run_moved = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    async def _move_batch(self, cutoff: datetime) -> int:
+        """Copy one batch to the archive, then remove it from the hot collection"""
+        todos = get_collection(self.collection_name)
+        archive = get_collection(self.archive_collection_name)
+
+        # Served by the status_updated_at index
+        eligible = {"status": TodoStatus.COMPLETED.value, "updated_at": {"$lt": cutoff}}
+        docs = await todos.find(eligible).limit(settings.archive_batch_size).to_list(length=settings.archive_batch_size)
+        if not docs:
+            return 0
+
+        try:
+            await archive.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicates come from an earlier interrupted run - the archive already has them
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+
+        ids = [doc["_id"] for doc in docs]
+        result = await todos.delete_many({"_id": {"$in": ids}, **eligible})
+
+        if result.deleted_count < len(ids):
+            # Some todos changed after being copied: edited ones stay hot, deleted ones (tombstoned
+            # before their own archive cleanup ran) are gone for good - drop both archive copies
+            still_hot = [doc["_id"] async for doc in todos.find({"_id": {"$in": ids}}, {"_id": 1})]
+            tombstones = get_collection(self.tombstones_collection_name)
+            deleted = [doc["_id"] async for doc in tombstones.find({"_id": {"$in": ids}}, {"_id": 1})]
+            if still_hot or deleted:
+                await archive.delete_many({"_id": {"$in": still_hot + deleted}})
+
+        # Archived todos leave the default list, so cached lists and list ETags must change
+        for user_id in {doc.get("user_id") for doc in docs}:
+            todo_cache.invalidate_user(user_id)
+            await counter_crud.apply(user_id, [])
+
+        return result.deleted_count
+
+    async def run_once(self) -> int:
+        """Archive every eligible todo in batches, returns how many were moved"""
+        cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+        moved = 0
+        try:
+            while True:
+                batch_moved = await self._move_batch(cutoff)
+                moved += batch_moved
+                if batch_moved < settings.archive_batch_size:
+                    break
+            self.last_error = None
+        except Exception as e:
+            print(f"❌ Todo archival failed: {e}")
+            self.last_error = str(e)
+        finally:
+            self.runs += 1
+            self.moved += moved
+            self.last_run_moved = moved
+            self.last_run_at = datetime.utcnow()
+
+        if moved:
+            print(f"🗄️ Archived {moved} completed todo(s)")
+        return moved
+
+    async def run_forever(self):
+        """Archive on a fixed interval until cancelled"""
+        while True:
+            await self.run_once()
+            await asyncio.sleep(settings.archive_interval_minutes * 60)
+
+    def stats(self) -> dict:
+        """Archival metrics"""
+        return {
+            "runs": self.runs,
+            "moved_total": self.moved,
+            "moved_last_run": self.last_run_moved,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "archive_after_days": settings.archive_after_days,
+            "batch_size": settings.archive_batch_size,
+        }
+
+# Create instance for the lifespan task and admin endpoints
+todo_archiver = TodoArchiver()
@@ -0,0 +1,125 @@
+# Per-user todo counters (total, per status, per priority) maintained with $inc
+# The same document carries a change "version" bumped on every todo write (used for ETags)
+from typing import Dict, Iterable, Optional, Tuple
+from app.core.database import get_collection
+from app.schemas.todo import PriorityLevel, TodoStatus
+
+# A change to apply: (status value, priority value, +1 / -1)
+CounterDelta = Tuple[str, str, int]
+
+
+def _empty_counters() -> dict:
+    """Counters document body with every status/priority zero-filled"""
+    return {
+        "total": 0,
+        "by_status": {status.value: 0 for status in TodoStatus},
+        "by_priority": {priority.value: 0 for priority in PriorityLevel},
+        "matrix": {
+            status.value: {priority.value: 0 for priority in PriorityLevel}
+            for status in TodoStatus
+        }
+    }
+
+
+def _add(counters: dict, status: str, priority: str, count: int):
+    """Add count to every counter a (status, priority) pair contributes to"""
+    counters["total"] += count
+    counters["by_status"][status] = counters["by_status"].get(status, 0) + count
+    counters["by_priority"][priority] = counters["by_priority"].get(priority, 0) + count
+    row = counters["matrix"].setdefault(status, {})
+    row[priority] = row.get(priority, 0) + count
+
+
+class CounterCRUD:
+    def __init__(self):
+        self.collection_name = "todo_counters"
+        self.todos_collection_name = "todos"
+        self.archive_collection_name = "todos_archive"
+
+    async def apply(self, user_id: str, deltas: Iterable[CounterDelta]):
+        """Atomically apply counter changes for one user with a single $inc (rebuilt when missing)"""
+        inc: Dict[str, int] = {}
+        for status, priority, count in deltas:
+            for key in ("total", f"by_status.{status}", f"by_priority.{priority}", f"matrix.{status}.{priority}"):
+                inc[key] = inc.get(key, 0) + count
+
+        inc = {key: count for key, count in inc.items() if count}
+        # Every write changes the user's todo list, even when no counter moves
+        inc["version"] = 1
+
+        try:
+            collection = get_collection(self.collection_name)
+            result = await collection.update_one({"_id": user_id}, {"$inc": inc})
+            if result.matched_count == 0:
+                # No counters yet (e.g. todos created before counters existed) - starting from zero
+                # would undercount, so count everything the user has, this write included
+                await self.rebuild(user_id)
+                await collection.update_one({"_id": user_id}, {"$inc": {"version": 1}})
+        except Exception as e:
+            # The todo write already succeeded - drift is fixed by the repair job
+            print(f"Error updating todo counters for {user_id}: {e}")
+
+    async def get_version(self, user_id: str) -> int:
+        """Get the user's change version (0 before the first write)"""
+        collection = get_collection(self.collection_name)
+        doc = await collection.find_one({"_id": user_id}, {"version": 1})
+        return doc.get("version", 0) if doc else 0
+
+    async def get(self, user_id: str) -> dict:
+        """Get a user's counters with a single point read (rebuilt if missing)"""
+        collection = get_collection(self.collection_name)
+        doc = await collection.find_one({"_id": user_id})
+        if doc is None:
+            return await self.rebuild(user_id)
+
+        counters = _empty_counters()
+        counters["total"] = doc.get("total", 0)
+        counters["by_status"].update(doc.get("by_status", {}))
+        counters["by_priority"].update(doc.get("by_priority", {}))
+        for status, row in doc.get("matrix", {}).items():
+            counters["matrix"].setdefault(status, {}).update(row)
+        return counters
+
+    async def rebuild(self, user_id: Optional[str] = None) -> Optional[dict]:
+        """Recompute counters from the todos collection (one user, or every user when None)"""
+        todos = get_collection(self.todos_collection_name)
+        collection = get_collection(self.collection_name)
+
+        # Archived todos still belong to the user, so they stay in the counts
+        branch = [{"$match": {"user_id": user_id}}] if user_id is not None else []
+        pipeline = branch + [
+            {"$unionWith": {"coll": self.archive_collection_name, "pipeline": branch}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "status": "$status", "priority": "$priority"},
+                "count": {"$sum": 1}
+            }}
+        ]
+
+        per_user: Dict[str, dict] = {}
+        async for row in todos.aggregate(pipeline):
+            key = row["_id"]
+            counters = per_user.setdefault(key["user_id"], _empty_counters())
+            _add(
+                counters,
+                key.get("status", TodoStatus.NOT_STARTED.value),
+                key.get("priority", PriorityLevel.LOW.value),
+                row["count"]
+            )
+
+        if user_id is not None:
+            per_user.setdefault(user_id, _empty_counters())
+
+        # $set (not replace) so the change version survives a rebuild
+        for owner, counters in per_user.items():
+            await collection.update_one({"_id": owner}, {"$set": counters}, upsert=True)
+
+        if user_id is None:
+            # Users whose todos are all gone are reset to zero
+            await collection.update_many({"_id": {"$nin": list(per_user)}}, {"$set": _empty_counters()})
+            print(f"🔢 Rebuilt todo counters for {len(per_user)} user(s)")
+            return None
+
+        return per_user[user_id]
+
+# Create instance for use in CRUD classes and API endpoints
+counter_crud = CounterCRUD()
@@ -0,0 +1,111 @@
+# Revoked access tokens (logout), checked through an in-memory Bloom filter
+import asyncio
+from datetime import datetime
+from typing import Optional, Set
+from app.core.config import settings
+from app.core.database import get_collection
+from app.utils.bloom import BloomFilter
+
+
+class RevokedTokenCRUD:
+    """
+    Revoked token ids (jti) live in revoked_tokens until the token would have expired anyway.
+
+    Every worker keeps a Bloom filter of them, rebuilt from the collection on an
+    interval. A filter miss proves a token was not revoked, so only filter hits
+    (real revocations and rare false positives) cost a database read.
+    """
+
+    def __init__(self):
+        self.collection_name = "revoked_tokens"
+        self._filter = BloomFilter(settings.revocation_bloom_capacity, settings.revocation_bloom_error_rate)
+        # Revocations made while a sync is reading the collection, re-added to the new filter
+        self._revoked_during_sync: Optional[Set[str]] = None
+        self.checks = 0
+        self.filter_hits = 0
+        self.confirmed = 0
+        self.syncs = 0
+        # The filter only proves anything after one complete sync
+        self.synced = False
+        self.last_sync_at: Optional[datetime] = None
+
+    async def revoke(self, jti: str, expires_at: datetime):
+        """Revoke a token until its expiry"""
+        collection = get_collection(self.collection_name)
+        await collection.update_one(
+            {"_id": jti},
+            {"$setOnInsert": {"expires_at": expires_at, "revoked_at": datetime.utcnow()}},
+            upsert=True
+        )
+        # Visible to this worker immediately, to the others after their next sync
+        self._filter.add(jti)
+        if self._revoked_during_sync is not None:
+            self._revoked_during_sync.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check a token id, reading the database only when the filter may contain it"""
+        self.checks += 1
+        if self.synced and jti not in self._filter:
+            return False
+        self.filter_hits += 1
+
+        collection = get_collection(self.collection_name)
+        # Expired entries may outlive expires_at until the TTL monitor runs, they are harmless
+        revoked = await collection.find_one({"_id": jti}, {"_id": 1}) is not None
+        if revoked:
+            self.confirmed += 1
+        return revoked
+
+    async def sync(self):
+        """Rebuild the filter from the collection (also drops expired revocations)"""
+        collection = get_collection(self.collection_name)
+        self._revoked_during_sync = set()
+        try:
+            query = {"expires_at": {"$gt": datetime.utcnow()}}
+            count = await collection.count_documents(query)
+            # Leave headroom so the false positive rate holds until the next sync
+            new_filter = BloomFilter(
+                max(settings.revocation_bloom_capacity, count * 2),
+                settings.revocation_bloom_error_rate
+            )
+            async for doc in collection.find(query, {"_id": 1}):
+                new_filter.add(doc["_id"])
+            for jti in self._revoked_during_sync:
+                new_filter.add(jti)
+            self._filter = new_filter
+        finally:
+            self._revoked_during_sync = None
+
+        self.synced = True
+        self.syncs += 1
+        self.last_sync_at = datetime.utcnow()
+
+    async def run_forever(self):
+        """Keep the filter in sync until cancelled (the first sync happens at startup)"""
+        while True:
+            # Retry quickly while every check still has to read the database
+            await asyncio.sleep(settings.revocation_sync_seconds if self.synced else 5)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Revoked token sync failed: {e}")
+
+    def stats(self) -> dict:
+        """Filter effectiveness and size"""
+        false_positives = self.filter_hits - self.confirmed
+        return {
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "confirmed_revoked": self.confirmed,
+            "false_positives": false_positives,
+            "database_reads_avoided": self.checks - self.filter_hits,
+            "synced": self.synced,
+            "syncs": self.syncs,
+            "last_sync_at": self.last_sync_at,
+            "filter": self._filter.stats(),
+        }
+
+# Create instance for use in auth dependencies and endpoints
+revoked_token_crud = RevokedTokenCRUD()
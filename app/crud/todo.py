@@ -1,15 +1,62 @@
 # Todo CRUD operations for database interactions
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
-from pymongo.errors import DuplicateKeyError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from app.core.database import get_collection
-from app.schemas.todo import TodoCreate, TodoUpdate, PriorityLevel, TodoStatus
+from app.schemas.todo import TodoCreate, TodoUpdate, TodoBulkUpdateItem, PriorityLevel, TodoStatus
 from app.models.todo import TodoModel
+from app.utils.helpers import (
+    encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor,
+    datetime_to_millis, millis_to_datetime
+)
+from app.crud.counters import counter_crud
+from app.core.events import publish_todo_event
+from app.core.config import settings
+from app.utils.cache import UserScopedCache, MISS
+from app.utils.singleflight import SingleFlight
+
+# Newest first, _id breaks ties so the order is total and stable
+TODO_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def build_projection(fields: Optional[List[str]], *required: str) -> Optional[dict]:
+    """Turn requested response fields into a Mongo projection (None = whole document)"""
+    if fields is None:
+        return None
+    projection = {field: 1 for field in fields if field != "id"}
+    projection.update({field: 1 for field in required})
+    # _id is always returned by Mongo unless explicitly excluded
+    return projection or {"_id": 1}
+
+def estimate_size(value) -> int:
+    """Rough memory footprint of a cached read result"""
+    if isinstance(value, list):
+        return 64 + sum(estimate_size(item) for item in value)
+    if isinstance(value, TodoModel):
+        return 512 + len(value.name or "") + len(value.description or "")
+    return 64
+
+
+# Per-process read cache, invalidated on every write of the same user
+todo_cache = UserScopedCache(
+    ttl_seconds=settings.todo_cache_ttl_seconds,
+    max_entries=settings.todo_cache_max_entries,
+    max_bytes=settings.todo_cache_max_bytes,
+    size_of=estimate_size
+)
+
+# Identical concurrent reads share one database round trip
+# Keys end with the user's cache generation, so a read never joins a flight started before a write
+todo_reads = SingleFlight()
+
 
 class TodoCRUD:
     def __init__(self):
         self.collection_name = "todos"
+        self.tombstones_collection_name = "todo_tombstones"
+        self.archive_collection_name = "todos_archive"
     
     async def create_todo(self, todo: TodoCreate, user_id: str = "default_user") -> TodoModel:
         """Create a new todo in database"""
@@ -25,38 +72,87 @@ class TodoCRUD:
                 user_id=user_id
             )
             
-            # Insert into MongoDB
-            result = collection.insert_one(new_todo.to_dict())
-            
-            # Get the inserted document
-            created_doc = collection.find_one({"_id": result.inserted_id})
-            return TodoModel.from_dict(created_doc)
+            # Insert into MongoDB - the model already holds every stored field (incl. _id)
+            await collection.insert_one(new_todo.to_dict())
+            await self._after_write(user_id, [(new_todo.status.value, new_todo.priority.value, 1)])
+            publish_todo_event("created", user_id, new_todo.to_response_dict())
+            return new_todo
             
         except Exception as e:
             print(f"Error creating todo: {e}")
             raise
     
-    async def get_todo(self, todo_id: str, user_id: str = "default_user") -> Optional[TodoModel]:
-        """Get a todo by ID"""
-        try:
+    async def get_todo(
+        self,
+        todo_id: str,
+        user_id: str = "default_user",
+        fields: Optional[List[str]] = None,
+        updated_at: Optional[datetime] = None
+    ) -> Optional[TodoModel]:
+        """
+        Get a todo by ID (fields limits which attributes are loaded, updated_at is always loaded for ETags)
+        
+        updated_at is the todo's current modification time when the caller already read it (see
+        get_todo_updated_at). It is part of the cache key, so a todo changed through another process
+        is never served from here; without it the cache is bypassed.
+        
+        Returns None for a malformed or unknown ID, database errors are raised to the caller.
+        """
+        if not ObjectId.is_valid(todo_id):
+            return None
+        
+        cacheable = settings.todo_cache_enabled and updated_at is not None
+        cache_key = (user_id, "todo", todo_id, tuple(fields) if fields is not None else None, updated_at)
+        if cacheable:
+            cached = todo_cache.get(cache_key)
+            if cached is not MISS:
+                return cached
+        generation = todo_cache.generation(user_id)
+        
+        async def load() -> Optional[TodoModel]:
             collection = get_collection(self.collection_name)
             
-            # Convert string ID to ObjectId
-            object_id = ObjectId(todo_id)
+            # Find the document (archived todos stay readable by ID)
+            query = {"_id": ObjectId(todo_id), "user_id": user_id}
+            projection = build_projection(fields, "updated_at")
+            doc = await collection.find_one(query, projection)
+            if doc is None:
+                doc = await get_collection(self.archive_collection_name).find_one(query, projection)
             
-            # Find the document
-            doc = collection.find_one({
-                "_id": object_id, 
-                "user_id": user_id
-            })
-            
-            if doc:
-                return TodoModel.from_dict(doc)
-            return None
-            
-        except Exception as e:
-            print(f"Error getting todo {todo_id}: {e}")
-            return None
+            todo = TodoModel.from_dict(doc) if doc else None
+            # A todo modified since updated_at was read belongs to another key
+            if cacheable and todo is not None and todo.updated_at == updated_at:
+                todo_cache.set(cache_key, todo, generation)
+            return todo
+        
+        # A failed read is shared by the whole flight and never cached
+        return await todo_reads.do(cache_key + (generation,), load)
+    
+    async def _find_docs(
+        self,
+        query: dict,
+        projection: Optional[dict],
+        limit: int,
+        skip: int = 0,
+        include_archived: bool = False
+    ) -> List[dict]:
+        """Run a sorted todo query on the hot collection, or on hot + archive via $unionWith"""
+        collection = get_collection(self.collection_name)
+        
+        if not include_archived:
+            cursor = collection.find(query, projection).sort(TODO_SORT).skip(skip).limit(limit)
+            return await cursor.to_list(length=limit)
+        
+        branch = [{"$match": query}]
+        if projection:
+            branch.append({"$project": projection})
+        pipeline = branch + [
+            {"$unionWith": {"coll": self.archive_collection_name, "pipeline": branch}},
+            {"$sort": dict(TODO_SORT)},
+            {"$skip": skip},
+            {"$limit": limit}
+        ]
+        return await collection.aggregate(pipeline).to_list(length=limit)
     
     async def get_todos(
         self, 
@@ -64,12 +160,28 @@ class TodoCRUD:
         skip: int = 0, 
         limit: int = 100,
         status_filter: Optional[TodoStatus] = None,
-        priority_filter: Optional[PriorityLevel] = None
+        priority_filter: Optional[PriorityLevel] = None,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        version: Optional[int] = None
     ) -> List[TodoModel]:
-        """Get all todos for a user with optional filtering"""
-        try:
-            collection = get_collection(self.collection_name)
-            
+        """
+        Get all todos for a user with optional filtering (fields limits which attributes are loaded)
+        
+        version is the user's counters version when the caller already read it (for ETags). It is
+        part of the cache key, so a write made through another process is never served from here.
+        """
+        cache_key = (
+            user_id, "list", skip, limit, status_filter, priority_filter,
+            tuple(fields) if fields is not None else None, include_archived, version
+        )
+        if settings.todo_cache_enabled:
+            cached = todo_cache.get(cache_key)
+            if cached is not MISS:
+                return cached
+        generation = todo_cache.generation(user_id)
+        
+        async def load() -> List[TodoModel]:
             # Build query filter
             query = {"user_id": user_id}
             
@@ -80,20 +192,203 @@ class TodoCRUD:
                 query["priority"] = priority_filter.value
             
             # Find documents with pagination
-            cursor = collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
-            
-            todos = []
-            for doc in cursor:
-                todos.append(TodoModel.from_dict(doc))
+            docs = await self._find_docs(query, build_projection(fields), limit, skip=skip, include_archived=include_archived)
             
+            todos = [TodoModel.from_dict(doc) for doc in docs]
+            if settings.todo_cache_enabled:
+                todo_cache.set(cache_key, todos, generation)
             return todos
+        
+        # A failed read is shared by the whole flight and never cached
+        return await todo_reads.do(cache_key + (generation,), load)
+    
+    async def get_todos_page(
+        self,
+        user_id: str = "default_user",
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status_filter: Optional[TodoStatus] = None,
+        priority_filter: Optional[PriorityLevel] = None,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        version: Optional[int] = None
+    ) -> Tuple[List[TodoModel], Optional[str]]:
+        """Get a page of todos using keyset (cursor) pagination, returns (todos, next_cursor)"""
+        # Decode first so a malformed cursor surfaces as ValueError to the caller
+        position = decode_cursor(cursor) if cursor else None
+        limit = max(limit, 1)
+        
+        # Build query filter
+        query = {"user_id": user_id}
+        
+        if status_filter:
+            query["status"] = status_filter.value
+            
+        if priority_filter:
+            query["priority"] = priority_filter.value
+        
+        # Seek directly past the last item of the previous page via the index
+        if position:
+            created_at, last_id = position
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}}
+            ]
+        
+        # Fetch one extra document to know whether another page exists
+        # created_at is always loaded because the next cursor is built from it
+        projection = build_projection(fields, "created_at")
+        flight_key = (
+            user_id, "page", cursor, limit, status_filter, priority_filter,
+            tuple(fields) if fields is not None else None, include_archived, version,
+            todo_cache.generation(user_id)
+        )
+        docs = await todo_reads.do(
+            flight_key,
+            lambda: self._find_docs(query, projection, limit + 1, include_archived=include_archived)
+        )
+        
+        todos = [TodoModel.from_dict(doc) for doc in docs[:limit]]
+        
+        next_cursor = None
+        if len(docs) > limit:
+            last = todos[-1]
+            next_cursor = encode_cursor(last.created_at, last._id)
+        
+        return todos, next_cursor
+    
+    async def iter_todos(self, user_id: str = "default_user", batch_size: int = 500) -> AsyncIterator[TodoModel]:
+        """Stream every todo of a user straight from a Mongo cursor (constant memory)"""
+        collection = get_collection(self.collection_name)
+        cursor = collection.find({"user_id": user_id}).sort(TODO_SORT).batch_size(batch_size)
+        async for doc in cursor:
+            yield TodoModel.from_dict(doc)
+    
+    async def search_todos(
+        self,
+        query_text: str,
+        user_id: str = "default_user",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        status_filter: Optional[TodoStatus] = None,
+        priority_filter: Optional[PriorityLevel] = None,
+        include_archived: bool = False
+    ) -> Tuple[List[Tuple[TodoModel, float]], Optional[str]]:
+        """Full-text search over name/description ranked by relevance, returns ([(todo, score)], next_cursor)"""
+        # Decode first so a malformed cursor surfaces as ValueError to the caller
+        position = decode_search_cursor(cursor) if cursor else None
+        limit = max(limit, 1)
+        
+        collection = get_collection(self.collection_name)
+        
+        # user_id equality is the prefix of the user_text_search index
+        match = {"user_id": user_id, "$text": {"$search": query_text}}
+        
+        if status_filter:
+            match["status"] = status_filter.value
             
+        if priority_filter:
+            match["priority"] = priority_filter.value
+        
+        pipeline = [
+            {"$match": match},
+            {"$addFields": {"score": {"$meta": "textScore"}}}
+        ]
+        if include_archived:
+            # todos_archive carries the same text index, $text must lead each branch
+            pipeline.append({"$unionWith": {"coll": self.archive_collection_name, "pipeline": list(pipeline)}})
+        
+        # Keyset on (score, _id) - same idea as get_todos_page
+        if position:
+            last_score, last_id = position
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": last_score}},
+                {"score": last_score, "_id": {"$lt": last_id}}
+            ]}})
+        
+        pipeline += [
+            {"$sort": {"score": -1, "_id": -1}},
+            {"$limit": limit + 1}
+        ]
+        
+        docs = await collection.aggregate(pipeline).to_list(length=limit + 1)
+        hits = [(TodoModel.from_dict(doc), doc["score"]) for doc in docs[:limit]]
+        
+        next_cursor = None
+        if len(docs) > limit:
+            last_todo, last_score = hits[-1]
+            next_cursor = encode_search_cursor(last_score, last_todo._id)
+        
+        return hits, next_cursor
+    
+    async def _after_write(self, user_id: str, deltas: List[Tuple[str, str, int]]):
+        """Keep derived state in step with a todo write: counters/version and the read cache"""
+        todo_cache.invalidate_user(user_id)
+        await counter_crud.apply(user_id, deltas)
+    
+    async def _recount(self, user_id: str):
+        """Like _after_write, for a bulk write that raced another writer - its deltas cannot be trusted"""
+        todo_cache.invalidate_user(user_id)
+        try:
+            await counter_crud.rebuild(user_id)
         except Exception as e:
-            print(f"Error getting todos: {e}")
+            print(f"Error recounting todos for {user_id}: {e}")
+        await counter_crud.apply(user_id, [])
+    
+    def _counter_deltas(self, before: Optional[dict], after: Optional[dict]) -> List[Tuple[str, str, int]]:
+        """Counter changes for a todo going from before to after (None = absent)"""
+        deltas = []
+        if before is not None:
+            deltas.append((
+                before.get("status", TodoStatus.NOT_STARTED.value),
+                before.get("priority", PriorityLevel.LOW.value),
+                -1
+            ))
+        if after is not None:
+            deltas.append((
+                after.get("status", TodoStatus.NOT_STARTED.value),
+                after.get("priority", PriorityLevel.LOW.value),
+                1
+            ))
+        # An unchanged status/priority cancels out to no counter update
+        if len(deltas) == 2 and deltas[0][:2] == deltas[1][:2]:
             return []
+        return deltas
+    
+    def _build_update_data(self, todo_update: TodoUpdate) -> dict:
+        """Build the $set document for a partial todo update"""
+        # Truncate to BSON millisecond precision so the returned post-image (and its ETag) matches storage
+        update_data = {"updated_at": millis_to_datetime(datetime_to_millis(datetime.utcnow()))}
+        
+        if todo_update.name is not None:
+            update_data["name"] = todo_update.name
+        if todo_update.description is not None:
+            update_data["description"] = todo_update.description
+        if todo_update.priority is not None:
+            update_data["priority"] = todo_update.priority.value
+        if todo_update.status is not None:
+            update_data["status"] = todo_update.status.value
+        
+        return update_data
+    
+    async def get_todo_updated_at(self, todo_id: str, user_id: str = "default_user") -> Optional[datetime]:
+        """Get only a todo's last modification time (cheap ETag check), None for a malformed or unknown ID"""
+        if not ObjectId.is_valid(todo_id):
+            return None
+        query = {"_id": ObjectId(todo_id), "user_id": user_id}
+        doc = await get_collection(self.collection_name).find_one(query, {"updated_at": 1})
+        if doc is None:
+            doc = await get_collection(self.archive_collection_name).find_one(query, {"updated_at": 1})
+        return doc.get("updated_at") if doc else None
     
-    async def update_todo(self, todo_id: str, todo_update: TodoUpdate, user_id: str = "default_user") -> Optional[TodoModel]:
-        """Update a todo"""
+    async def update_todo(
+        self,
+        todo_id: str,
+        todo_update: TodoUpdate,
+        user_id: str = "default_user",
+        expected_updated_at: Optional[List[datetime]] = None
+    ) -> Optional[TodoModel]:
+        """Update a todo (only if still at one of expected_updated_at, when given)"""
         try:
             collection = get_collection(self.collection_name)
             
@@ -101,27 +396,32 @@ class TodoCRUD:
             object_id = ObjectId(todo_id)
             
             # Build update data - only include fields that are not None
-            update_data = {"updated_at": datetime.utcnow()}
-            
-            if todo_update.name is not None:
-                update_data["name"] = todo_update.name
-            if todo_update.description is not None:
-                update_data["description"] = todo_update.description
-            if todo_update.priority is not None:
-                update_data["priority"] = todo_update.priority.value
-            if todo_update.status is not None:
-                update_data["status"] = todo_update.status.value
-            
-            # Update the document
-            result = collection.update_one(
-                {"_id": object_id, "user_id": user_id},
-                {"$set": update_data}
+            update_data = self._build_update_data(todo_update)
+            
+            # Update the document, the pre-image tells us how the counters move
+            query = {"_id": object_id, "user_id": user_id}
+            if expected_updated_at is not None:
+                query["updated_at"] = {"$in": expected_updated_at}
+            
+            previous_doc = await collection.find_one_and_update(
+                query,
+                {"$set": update_data},
+                return_document=ReturnDocument.BEFORE
             )
+            if previous_doc is None and await self._restore_archived([object_id], user_id):
+                # Editing an archived todo brings it back, the new updated_at keeps it hot
+                previous_doc = await collection.find_one_and_update(
+                    query,
+                    {"$set": update_data},
+                    return_document=ReturnDocument.BEFORE
+                )
             
-            if result.matched_count > 0:
-                # Return updated document
-                updated_doc = collection.find_one({"_id": object_id})
-                return TodoModel.from_dict(updated_doc)
+            if previous_doc:
+                updated_doc = {**previous_doc, **update_data}
+                await self._after_write(user_id, self._counter_deltas(previous_doc, updated_doc))
+                updated_todo = TodoModel.from_dict(updated_doc)
+                publish_todo_event("updated", user_id, updated_todo.to_response_dict())
+                return updated_todo
             
             return None
             
@@ -129,38 +429,361 @@ class TodoCRUD:
             print(f"Error updating todo {todo_id}: {e}")
             return None
     
-    async def delete_todo(self, todo_id: str, user_id: str = "default_user") -> bool:
-        """Delete a todo"""
+    async def delete_todo(
+        self,
+        todo_id: str,
+        user_id: str = "default_user",
+        expected_updated_at: Optional[List[datetime]] = None
+    ) -> bool:
+        """Delete a todo (only if still at one of expected_updated_at, when given)"""
         try:
             collection = get_collection(self.collection_name)
             
             # Convert string ID to ObjectId
             object_id = ObjectId(todo_id)
             
-            # Delete the document
-            result = collection.delete_one({
-                "_id": object_id, 
-                "user_id": user_id
-            })
+            # Delete the document, keeping its status/priority for the counters
+            query = {"_id": object_id, "user_id": user_id}
+            if expected_updated_at is not None:
+                query["updated_at"] = {"$in": expected_updated_at}
+            
+            deleted_doc = await collection.find_one_and_delete(
+                query,
+                projection={"status": 1, "priority": 1}
+            )
+            from_archive = deleted_doc is None
+            if from_archive:
+                # Archived todos can be deleted too
+                deleted_doc = await get_collection(self.archive_collection_name).find_one_and_delete(
+                    query,
+                    projection={"status": 1, "priority": 1}
+                )
             
-            return result.deleted_count > 0
+            if deleted_doc is None:
+                return False
+            
+            await self._after_write(user_id, self._counter_deltas(deleted_doc, None))
+            await self._record_tombstones(user_id, [object_id])
+            await self._drop_archive_copies([object_id])
+            # The change stream only watches todos, archive deletes are always published here
+            publish_todo_event("deleted", user_id, {"id": todo_id}, streamed=not from_archive)
+            return True
             
         except Exception as e:
             print(f"Error deleting todo {todo_id}: {e}")
             return False
     
-    async def get_todos_count(self, user_id: str = "default_user") -> int:
-        """Get total count of todos for a user"""
+    async def _record_tombstones(self, user_id: str, object_ids: List[ObjectId]):
+        """Remember deletions so delta sync can tell offline clients about them"""
         try:
-            collection = get_collection(self.collection_name)
-            return collection.count_documents({"user_id": user_id})
+            collection = get_collection(self.tombstones_collection_name)
+            deleted_at = datetime.utcnow()
+            await collection.insert_many(
+                [{"_id": object_id, "user_id": user_id, "deleted_at": deleted_at} for object_id in object_ids],
+                ordered=False
+            )
         except Exception as e:
-            print(f"Error counting todos: {e}")
-            return 0
+            print(f"Error recording tombstones: {e}")
+    
+    async def get_changes(
+        self,
+        user_id: str,
+        since: Optional[datetime],
+        until: datetime,
+        max_changes: int
+    ) -> Optional[Tuple[List[TodoModel], List[str]]]:
+        """
+        Todos changed and IDs deleted in (since, until], None when a delta has more than max_changes
+        
+        A full sync (since=None) is never capped - it is what a client falls back to after a 410.
+        """
+        window = {"$lte": until}
+        if since is not None:
+            window["$gt"] = since
+        
+        collection = get_collection(self.collection_name)
+        cursor = collection.find({"user_id": user_id, "updated_at": window}).sort("updated_at", 1)
+        if since is None:
+            docs = await cursor.to_list(length=None)
+            return [TodoModel.from_dict(doc) for doc in docs], []
+        
+        docs = await cursor.limit(max_changes + 1).to_list(length=max_changes + 1)
+        if len(docs) > max_changes:
+            return None
+        
+        deleted = []
+        tombstones = get_collection(self.tombstones_collection_name)
+        remaining = max_changes - len(docs)
+        async for tombstone in tombstones.find(
+            {"user_id": user_id, "deleted_at": window}, {"_id": 1}
+        ).limit(remaining + 1):
+            deleted.append(str(tombstone["_id"]))
+        if len(deleted) > remaining:
+            return None
+        
+        return [TodoModel.from_dict(doc) for doc in docs], deleted
+    
+    async def get_todos_count(self, user_id: str = "default_user") -> int:
+        """Get total count of todos for a user (single read of the counters document)"""
+        # Not cached: checking a cached count for freshness would read the same document
+        counters = await todo_reads.do(
+            (user_id, "counters", todo_cache.generation(user_id)),
+            lambda: counter_crud.get(user_id)
+        )
+        return counters["total"]
+    
+    async def get_todos_summary(self, user_id: str = "default_user") -> dict:
+        """Get totals by status, by priority and the status x priority matrix"""
+        # Served from the incrementally maintained counters - O(1) in the number of todos
+        return await todo_reads.do(
+            (user_id, "counters", todo_cache.generation(user_id)),
+            lambda: counter_crud.get(user_id)
+        )
     
     async def get_todos_by_status(self, status: TodoStatus, user_id: str = "default_user") -> List[TodoModel]:
         """Get all todos with specific status"""
         return await self.get_todos(user_id=user_id, status_filter=status)
+    
+    def _parse_ids(self, todo_ids: List[str], results: List[dict]) -> List[Tuple[int, ObjectId]]:
+        """Convert string IDs to ObjectIds, recording a per-item error for invalid ones"""
+        parsed = []
+        for index, todo_id in enumerate(todo_ids):
+            try:
+                parsed.append((index, ObjectId(todo_id)))
+            except Exception:
+                results[index] = {"index": index, "id": todo_id, "success": False, "error": "Invalid todo ID"}
+        return parsed
+    
+    def _apply_write_errors(self, error: BulkWriteError, positions: List[int], results: List[dict], ordered: bool):
+        """Mark items that failed (or were never attempted) in a bulk write"""
+        failed = {}
+        for write_error in error.details.get("writeErrors", []):
+            failed[write_error["index"]] = write_error.get("errmsg", "Write failed")
+        
+        first_failure = min(failed) if failed else len(positions)
+        for op_index, position in enumerate(positions):
+            if op_index in failed:
+                results[position].update(success=False, error=failed[op_index])
+            elif ordered and op_index > first_failure:
+                results[position].update(success=False, error="Not attempted after an earlier failure")
+    
+    async def _find_owned(self, parsed: List[Tuple[int, ObjectId]], user_id: str, collection_name: Optional[str] = None) -> dict:
+        """Map _id -> {status, priority} for the given IDs owned by the user (in todos unless collection_name is given)"""
+        existing = {}
+        if parsed:
+            collection = get_collection(collection_name or self.collection_name)
+            async for doc in collection.find(
+                {"_id": {"$in": [object_id for _, object_id in parsed]}, "user_id": user_id},
+                {"status": 1, "priority": 1}
+            ):
+                existing[doc["_id"]] = doc
+        return existing
+    
+    async def _restore_archived(self, object_ids: List[ObjectId], user_id: str) -> int:
+        """Move the user's archived todos among object_ids back to todos, returns how many moved"""
+        archive = get_collection(self.archive_collection_name)
+        docs = await archive.find(
+            {"_id": {"$in": object_ids}, "user_id": user_id}
+        ).to_list(length=len(object_ids))
+        if not docs:
+            return 0
+        
+        try:
+            await get_collection(self.collection_name).insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Already hot again (e.g. a concurrent restore)
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+        await archive.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+        
+        # Counters include archived todos, but default lists now contain these again
+        await self._after_write(user_id, [])
+        return len(docs)
+    
+    async def _drop_archive_copies(self, object_ids: List[ObjectId]):
+        """Remove archive copies of deleted todos that the archiver copied just before the delete"""
+        try:
+            await get_collection(self.archive_collection_name).delete_many({"_id": {"$in": object_ids}})
+        except Exception as e:
+            print(f"Error removing archived copies: {e}")
+    
+    async def bulk_create_todos(self, todos: List[TodoCreate], user_id: str = "default_user", ordered: bool = False) -> List[dict]:
+        """Create many todos with a single insert_many, returns per-item results"""
+        collection = get_collection(self.collection_name)
+        
+        new_todos = [
+            TodoModel(
+                name=todo.name,
+                description=todo.description,
+                priority=todo.priority,
+                status=todo.status,
+                user_id=user_id
+            )
+            for todo in todos
+        ]
+        results = [
+            {"index": index, "id": str(todo._id), "success": True, "error": None}
+            for index, todo in enumerate(new_todos)
+        ]
+        if not new_todos:
+            return results
+        
+        try:
+            await collection.insert_many([todo.to_dict() for todo in new_todos], ordered=ordered)
+        except BulkWriteError as e:
+            print(f"Bulk create partially failed: {len(e.details.get('writeErrors', []))} error(s)")
+            self._apply_write_errors(e, list(range(len(new_todos))), results, ordered)
+        
+        created = [todo for todo, result in zip(new_todos, results) if result["success"]]
+        await self._after_write(user_id, [(todo.status.value, todo.priority.value, 1) for todo in created])
+        for todo in created:
+            publish_todo_event("created", user_id, todo.to_response_dict())
+        return results
+    
+    async def bulk_update_todos(self, items: List[TodoBulkUpdateItem], user_id: str = "default_user", ordered: bool = False) -> List[dict]:
+        """
+        Apply many partial updates with a single bulk_write, returns per-item results
+        
+        ordered=True stops at the first failure: an invalid or unknown ID, or a failed write.
+        Later items are reported as not attempted.
+        """
+        collection = get_collection(self.collection_name)
+        
+        results: List[Optional[dict]] = [None] * len(items)
+        parsed = self._parse_ids([item.id for item in items], results)
+        if ordered:
+            # Nothing past the first invalid ID is attempted
+            first_invalid = next((index for index, result in enumerate(results) if result is not None), len(items))
+            parsed = [(index, object_id) for index, object_id in parsed if index < first_invalid]
+        
+        # Archived todos are brought back before being edited, like single updates
+        if parsed:
+            await self._restore_archived([object_id for _, object_id in parsed], user_id)
+        
+        # One query to find which of the requested todos belong to this user
+        existing = await self._find_owned(parsed, user_id)
+        object_ids = dict(parsed)
+        
+        operations = []
+        positions = []
+        deltas = {}
+        changes = {}
+        stopped = False
+        for index, item in enumerate(items):
+            if stopped:
+                results[index] = {
+                    "index": index, "id": item.id, "success": False, "error": "Not attempted after an earlier failure"
+                }
+                continue
+            object_id = object_ids.get(index)
+            if object_id is None or object_id not in existing:
+                if results[index] is None:
+                    results[index] = {"index": index, "id": item.id, "success": False, "error": "Todo not found"}
+                stopped = ordered
+                continue
+            update_data = self._build_update_data(item)
+            # Only written while status/priority are still what the deltas were computed from
+            operations.append(UpdateOne(
+                {
+                    "_id": object_id,
+                    "user_id": user_id,
+                    "status": existing[object_id].get("status"),
+                    "priority": existing[object_id].get("priority")
+                },
+                {"$set": update_data}
+            ))
+            positions.append(index)
+            deltas[index] = self._counter_deltas(existing[object_id], {**existing[object_id], **update_data})
+            changes[index] = update_data
+            results[index] = {"index": index, "id": item.id, "success": True, "error": None}
+        
+        matched = 0
+        if operations:
+            try:
+                matched = (await collection.bulk_write(operations, ordered=ordered)).matched_count
+            except BulkWriteError as e:
+                print(f"Bulk update partially failed: {len(e.details.get('writeErrors', []))} error(s)")
+                self._apply_write_errors(e, positions, results, ordered)
+                matched = e.details.get("nMatched", 0)
+        
+        applied = [index for index in positions if results[index]["success"]]
+        raced = matched < len(applied)
+        if raced:
+            # Another writer got in between the pre-read and the write: keep the todos carrying this write
+            current = {}
+            async for doc in collection.find(
+                {"_id": {"$in": [object_ids[index] for index in applied]}, "user_id": user_id},
+                {"updated_at": 1}
+            ):
+                current[doc["_id"]] = doc
+            for index in applied:
+                doc = current.get(object_ids[index])
+                if doc is None:
+                    results[index].update(success=False, error="Todo not found")
+                elif doc.get("updated_at") != changes[index]["updated_at"]:
+                    results[index].update(success=False, error="Todo was modified concurrently")
+            applied = [index for index in applied if results[index]["success"]]
+            await self._recount(user_id)
+        else:
+            await self._after_write(user_id, [delta for index in applied for delta in deltas[index]])
+        for index in applied:
+            # Bulk updates carry only the changed fields, clients merge them into their copy
+            publish_todo_event("updated", user_id, {"id": items[index].id, **changes[index]})
+        return results
+    
+    async def bulk_delete_todos(self, todo_ids: List[str], user_id: str = "default_user") -> List[dict]:
+        """Delete many todos with a single delete_many, returns per-item results"""
+        collection = get_collection(self.collection_name)
+        
+        results: List[Optional[dict]] = [None] * len(todo_ids)
+        parsed = self._parse_ids(todo_ids, results)
+        
+        # One query to find which of the requested todos belong to this user, one more for archived ones
+        existing = await self._find_owned(parsed, user_id)
+        archived = await self._find_owned(
+            [(index, object_id) for index, object_id in parsed if object_id not in existing],
+            user_id,
+            self.archive_collection_name
+        )
+        
+        for index, object_id in parsed:
+            found = object_id in existing or object_id in archived
+            results[index] = {
+                "index": index,
+                "id": todo_ids[index],
+                "success": found,
+                "error": None if found else "Todo not found"
+            }
+        
+        raced = False
+        for docs, target in ((existing, collection), (archived, get_collection(self.archive_collection_name))):
+            if not docs:
+                continue
+            # Only deleted while status/priority are still what the deltas are computed from
+            result = await target.delete_many({"user_id": user_id, "$or": [
+                {"_id": object_id, "status": doc.get("status"), "priority": doc.get("priority")}
+                for object_id, doc in docs.items()
+            ]})
+            if result.deleted_count < len(docs):
+                # Changed or deleted by someone else meanwhile - delete the rest and recount
+                raced = True
+                await target.delete_many({"_id": {"$in": list(docs)}, "user_id": user_id})
+        
+        removed = {**existing, **archived}
+        if raced:
+            await self._recount(user_id)
+        elif removed:
+            await self._after_write(user_id, [
+                delta for doc in removed.values() for delta in self._counter_deltas(doc, None)
+            ])
+        if removed:
+            await self._record_tombstones(user_id, list(removed))
+            if existing:
+                await self._drop_archive_copies(list(existing))
+            for object_id in removed:
+                publish_todo_event("deleted", user_id, {"id": str(object_id)}, streamed=object_id in existing)
+        
+        return results
 
 # Create instance for use in API endpoints
 todo_crud = TodoCRUD()
\ No newline at end of file
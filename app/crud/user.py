@@ -1,16 +1,31 @@
 # User CRUD operations for database interactions
+import asyncio
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 from app.core.database import get_collection
 from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import UserModel
-from app.core.security import get_hash_password, verify_password
+from app.core.security import password_hasher, PasswordHasherBusy, password_needs_rehash
+from app.core.config import settings
+from app.utils.cache import UserScopedCache
+
+# Per-process cache of resolved UserResponse objects for get_current_user
+# Bounded by entry count only (every entry counts as the default 256 bytes)
+user_cache = UserScopedCache(
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    max_entries=settings.user_cache_max_entries,
+    max_bytes=settings.user_cache_max_entries * 256
+)
 
 class UserCRUD:
     def __init__(self):
         self.collection_name = "users"
+        # Keeps background rehash tasks referenced until they finish
+        self._rehash_tasks = set()
+        self.rehashed = 0
     
     async def create_user(self, user: UserCreate) -> UserModel:
         """Create a new user in database"""
@@ -18,7 +33,7 @@ class UserCRUD:
             collection = get_collection(self.collection_name)
             
             # Check if user already exists
-            existing_user = collection.find_one({
+            existing_user = await collection.find_one({
                 "$or": [
                     {"email": user.email},
                     {"username": user.username}
@@ -32,7 +47,7 @@ class UserCRUD:
                     raise ValueError("User with this username already exists")
             
             # Create new user with hashed password
-            hashed_password = get_hash_password(user.password)
+            hashed_password = await password_hasher.hash(user.password)
             new_user = UserModel(
                 email=user.email,
                 username=user.username,
@@ -40,12 +55,9 @@ class UserCRUD:
                 fullname=user.fullname
             )
             
-            # Insert into MongoDB
-            result = collection.insert_one(new_user.to_dict())
-            
-            # Get the inserted document
-            created_doc = collection.find_one({"_id": result.inserted_id})
-            return UserModel.from_dict(created_doc)
+            # Insert into MongoDB - the model already holds every stored field (incl. _id)
+            await collection.insert_one(new_user.to_dict())
+            return new_user
             
         except Exception as e:
             print(f"Error creating user: {e}")
@@ -55,7 +67,7 @@ class UserCRUD:
         """Get user by email"""
         try:
             collection = get_collection(self.collection_name)
-            doc = collection.find_one({"email": email})
+            doc = await collection.find_one({"email": email})
             
             if doc:
                 return UserModel.from_dict(doc)
@@ -69,7 +81,7 @@ class UserCRUD:
         """Get user by username"""
         try:
             collection = get_collection(self.collection_name)
-            doc = collection.find_one({"username": username})
+            doc = await collection.find_one({"username": username})
             
             if doc:
                 return UserModel.from_dict(doc)
@@ -86,7 +98,7 @@ class UserCRUD:
             
             # Convert string ID to ObjectId
             object_id = ObjectId(user_id)
-            doc = collection.find_one({"_id": object_id})
+            doc = await collection.find_one({"_id": object_id})
             
             if doc:
                 return UserModel.from_dict(doc)
@@ -96,6 +108,17 @@ class UserCRUD:
             print(f"Error getting user by ID: {e}")
             return None
     
+    async def get_token_version(self, user_id: str) -> Optional[int]:
+        """Get the user's current token version (None when the user does not exist)"""
+        try:
+            collection = get_collection(self.collection_name)
+            doc = await collection.find_one({"_id": ObjectId(user_id)}, {"token_version": 1})
+            return doc.get("token_version", 0) if doc else None
+            
+        except Exception as e:
+            print(f"Error getting token version: {e}")
+            return None
+    
     async def authenticate_user(self, email_or_username: str, password: str) -> Optional[UserModel]:
         """Authenticate user with email/username and password"""
         try:
@@ -108,19 +131,49 @@ class UserCRUD:
                 return None
             
             # Verify password
-            if not verify_password(password, user.hashed_password):
+            if not await password_hasher.verify(password, user.hashed_password):
                 return None
             
+            # The plain password is only known now - upgrade outdated hashes without delaying the login
+            if password_needs_rehash(user.hashed_password):
+                task = asyncio.create_task(self._rehash_password(user, password))
+                self._rehash_tasks.add(task)
+                task.add_done_callback(self._rehash_tasks.discard)
+            
             # # Check if user is active
             # if not user.is_active:
             #     return None
             
             return user
             
+        except PasswordHasherBusy:
+            # Overload is not a wrong password - let the endpoint answer 503
+            raise
         except Exception as e:
             print(f"Error authenticating user: {e}")
             return None
     
+    async def _rehash_password(self, user: UserModel, password: str):
+        """Store a hash made with the current scheme and cost"""
+        try:
+            new_hash = await password_hasher.hash(password)
+            collection = get_collection(self.collection_name)
+            
+            # Only replace the hash that was verified, a concurrent password change wins
+            result = await collection.update_one(
+                {"_id": user._id, "hashed_password": user.hashed_password},
+                {"$set": {"hashed_password": new_hash}}
+            )
+            if result.modified_count:
+                self.rehashed += 1
+                print(f"🔐 Upgraded password hash for user {user._id}")
+            
+        except PasswordHasherBusy:
+            # Under load the upgrade simply waits for a later login
+            pass
+        except Exception as e:
+            print(f"Error upgrading password hash: {e}")
+    
     async def update_user(self, user_id: str, user_update: UserUpdate) -> Optional[UserModel]:
         """Update user information"""
         try:
@@ -134,7 +187,7 @@ class UserCRUD:
             
             if user_update.email is not None:
                 # Check if email is already taken by another user
-                existing_user = collection.find_one({
+                existing_user = await collection.find_one({
                     "email": user_update.email,
                     "_id": {"$ne": object_id}
                 })
@@ -144,7 +197,7 @@ class UserCRUD:
                 
             if user_update.username is not None:
                 # Check if username is already taken by another user
-                existing_user = collection.find_one({
+                existing_user = await collection.find_one({
                     "username": user_update.username,
                     "_id": {"$ne": object_id}
                 })
@@ -155,15 +208,21 @@ class UserCRUD:
             if user_update.fullname is not None:
                 update_data["fullname"] = user_update.fullname
             
-            # Update the document
-            result = collection.update_one(
+            update = {"$set": update_data}
+            if len(update_data) > 1:
+                # Stateless tokens embed the profile, so tokens issued before this change stop validating
+                update["$inc"] = {"token_version": 1}
+            
+            # Update the document and get the post-image in the same round trip
+            updated_doc = await collection.find_one_and_update(
                 {"_id": object_id},
-                {"$set": update_data}
+                update,
+                return_document=ReturnDocument.AFTER
             )
+            # The cached profile of this user is now stale
+            user_cache.invalidate_user(user_id)
             
-            if result.matched_count > 0:
-                # Return updated document
-                updated_doc = collection.find_one({"_id": object_id})
+            if updated_doc:
                 return UserModel.from_dict(updated_doc)
             
             return None
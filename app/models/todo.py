@@ -1,6 +1,6 @@
 # Todo database model (MongoDB document structure)
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from bson import ObjectId
 from app.schemas.todo import PriorityLevel, TodoStatus
 
@@ -42,11 +42,11 @@ class TodoModel:
 
     @classmethod
     def from_dict(cls, doc: dict):
-        """Create TodoModel instance from MongoDB document"""
+        """Create TodoModel instance from MongoDB document (projected documents leave fields as None)"""
         return cls(
             _id=doc.get("_id"),
-            name=doc["name"],
-            description=doc["description"],
+            name=doc.get("name"),
+            description=doc.get("description"),
             priority=PriorityLevel(doc.get("priority", PriorityLevel.LOW.value)),
             status=TodoStatus(doc.get("status", TodoStatus.NOT_STARTED.value)),
             user_id=doc.get("user_id", "default_user"),
@@ -54,9 +54,9 @@ class TodoModel:
             updated_at=doc.get("updated_at")
         )
 
-    def to_response_dict(self):
-        """Convert to dictionary for API responses"""
-        return {
+    def to_response_dict(self, fields: Optional[List[str]] = None):
+        """Convert to dictionary for API responses, optionally reduced to the given fields"""
+        response = {
             "id": str(self._id),
             "name": self.name,
             "description": self.description,
@@ -64,4 +64,7 @@ class TodoModel:
             "status": self.status,
             "created_at": self.created_at,
             "updated_at": self.updated_at
-        }
\ No newline at end of file
+        }
+        if fields is not None:
+            response = {key: value for key, value in response.items() if key == "id" or key in fields}
+        return response
\ No newline at end of file
@@ -15,6 +15,7 @@ class UserModel:
         _id: Optional[ObjectId] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
+        token_version: int = 0,
     ):
         self._id = _id or ObjectId()
         self.email = email
@@ -23,6 +24,7 @@ class UserModel:
         self.fullname = fullname
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
+        self.token_version = token_version
 
     def to_dict(self):
         """Convert to dictionary for MongoDB storage"""
@@ -34,6 +36,7 @@ class UserModel:
             "fullname": self.fullname,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "token_version": self.token_version,
         }
 
     @classmethod
@@ -47,6 +50,7 @@ class UserModel:
             fullname=doc.get("fullname"),
             created_at=doc.get("created_at"),
             updated_at=doc.get("updated_at"),
+            token_version=doc.get("token_version", 0),
         )
 
     def to_response_dict(self):
@@ -58,4 +62,13 @@ class UserModel:
             "fullname": self.fullname,
             "created_at": self.created_at,
             "updated_at": self.updated_at
+        }
+
+    def to_token_claims(self):
+        """Profile fields embedded in stateless access tokens"""
+        return {
+            "username": self.username,
+            "email": self.email,
+            "fullname": self.fullname,
+            "ver": self.token_version
         }
\ No newline at end of file
@@ -8,7 +8,19 @@ from .todo import (
     TodoBase, 
     TodoCreate, 
     TodoUpdate, 
-    TodoResponse
+    TodoResponse,
+    TodoPartialResponse,
+    TodoPage,
+    TodoSearchResult,
+    TodoSearchPage,
+    TodoChanges,
+    TodoBulkCreate,
+    TodoBulkUpdate,
+    TodoBulkUpdateItem,
+    TodoBulkDelete,
+    TodoBulkItemResult,
+    TodoBulkResponse,
+    TodoStatsSummary
 )
 
 from .user import (
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional, Union
 from enum import IntEnum, Enum
 from pydantic import BaseModel, Field
 
@@ -81,3 +81,132 @@ class TodoResponse(TodoBase):
 
     class Config:
         from_attributes = True
+
+
+# Fields a client may request through ?fields= (id is always returned)
+TODO_RESPONSE_FIELDS = ("id", "name", "description", "priority", "status")
+
+
+class TodoPartialResponse(BaseModel):
+    """Schema for a todo response reduced to the requested fields"""
+    id: str = Field(
+        ..., 
+        description="Unique identifier for the todo (MongoDB ObjectId as string)", 
+        example="507f1f77bcf86cd799439011"
+    )
+    name: Optional[str] = Field(None, description="Name of the todo")
+    description: Optional[str] = Field(None, description="Description of the todo")
+    priority: Optional[PriorityLevel] = Field(None, description="Priority level of the todo")
+    status: Optional[TodoStatus] = Field(None, description="Status of the todo")
+
+
+class TodoPage(BaseModel):
+    """Schema for a cursor-paginated page of todos"""
+    items: List[Union[TodoResponse, TodoPartialResponse]] = Field(
+        ...,
+        description="Todos on this page, newest first"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null when there are no more todos)"
+    )
+
+
+class TodoSearchResult(TodoResponse):
+    """Schema for a todo search hit with its relevance score"""
+    score: float = Field(..., description="Text relevance score (higher is more relevant)")
+
+
+class TodoSearchPage(BaseModel):
+    """Schema for a cursor-paginated page of search results"""
+    items: List[TodoSearchResult] = Field(
+        ...,
+        description="Matching todos, most relevant first"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null when there are no more results)"
+    )
+
+
+class TodoChanges(BaseModel):
+    """Schema for a delta sync response"""
+    changed: List[TodoResponse] = Field(
+        ...,
+        description="Todos created or updated since the token"
+    )
+    deleted: List[str] = Field(
+        ...,
+        description="IDs of todos deleted since the token"
+    )
+    next_token: str = Field(
+        ...,
+        description="Token to pass as since on the next sync"
+    )
+
+
+class TodoBulkCreate(BaseModel):
+    """Schema for creating many todos in one request"""
+    items: List[TodoCreate] = Field(
+        ...,
+        description="Todos to create"
+    )
+    ordered: bool = Field(
+        False,
+        description="Stop at the first failure instead of attempting every item"
+    )
+
+
+class TodoBulkUpdateItem(TodoUpdate):
+    """Schema for one item of a bulk update"""
+    id: str = Field(
+        ...,
+        description="ID of the todo to update (MongoDB ObjectId as string)",
+        example="507f1f77bcf86cd799439011"
+    )
+
+
+class TodoBulkUpdate(BaseModel):
+    """Schema for updating many todos in one request"""
+    items: List[TodoBulkUpdateItem] = Field(
+        ...,
+        description="Partial updates, each carrying the todo ID"
+    )
+    ordered: bool = Field(
+        False,
+        description="Stop at the first failure instead of attempting every item"
+    )
+
+
+class TodoBulkDelete(BaseModel):
+    """Schema for deleting many todos in one request"""
+    ids: List[str] = Field(
+        ...,
+        description="IDs of the todos to delete"
+    )
+
+
+class TodoBulkItemResult(BaseModel):
+    """Outcome of a single item in a bulk operation"""
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[str] = Field(None, description="Todo ID the item refers to")
+    success: bool = Field(..., description="Whether the item was applied")
+    error: Optional[str] = Field(None, description="Why the item was not applied")
+
+
+class TodoBulkResponse(BaseModel):
+    """Schema for bulk operation response"""
+    succeeded: int = Field(..., description="Number of items applied")
+    failed: int = Field(..., description="Number of items not applied")
+    results: List[TodoBulkItemResult] = Field(..., description="Per-item results in request order")
+
+
+class TodoStatsSummary(BaseModel):
+    """Schema for per-user todo statistics"""
+    total: int = Field(..., description="Total number of todos")
+    by_status: Dict[TodoStatus, int] = Field(..., description="Todo count per status")
+    by_priority: Dict[PriorityLevel, int] = Field(..., description="Todo count per priority")
+    matrix: Dict[TodoStatus, Dict[PriorityLevel, int]] = Field(
+        ...,
+        description="Todo count per status and priority"
+    )
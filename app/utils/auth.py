@@ -1,14 +1,32 @@
 # OAuth2 scheme for JWT token authentication
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.schemas.user import UserResponse
-from app.crud.user import user_crud
-from app.core.security import decode_access_token
+from app.crud.user import user_crud, user_cache
+from app.crud.revoked_token import revoked_token_crud
+from app.core.security import decode_access_token_claims
 from app.core.config import settings
+from app.utils.cache import MISS
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_str}/auth/token")
 
+async def get_token_version(user_id: str) -> Optional[int]:
+    """Current token version of a user, cached like resolved users and dropped by update_user"""
+    cache_key = (user_id, "token_version")
+    if settings.user_cache_enabled:
+        cached = user_cache.get(cache_key)
+        if cached is not MISS:
+            return cached
+    generation = user_cache.generation(user_id)
+    
+    token_version = await user_crud.get_token_version(user_id)
+    # None (missing user or a failed lookup) is not cached so a database blip cannot lock users out
+    if settings.user_cache_enabled and token_version is not None:
+        user_cache.set(cache_key, token_version, generation)
+    return token_version
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
     """Get current user from JWT token"""
     credentials_exception = HTTPException(
@@ -19,9 +37,33 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
     
     try:
         # Decode JWT token
-        user_id = decode_access_token(token)
-        if user_id is None:
+        claims = decode_access_token_claims(token)
+        if claims is None:
+            raise credentials_exception
+        user_id = claims["sub"]
+        
+        # Logged out tokens (tokens issued before logout existed have no jti)
+        if "jti" in claims and await revoked_token_crud.is_revoked(claims["jti"]):
             raise credentials_exception
+        
+        # Stateless tokens carry the profile - only check they were issued for the current version
+        if settings.auth_stateless_tokens and "ver" in claims:
+            if claims["ver"] != await get_token_version(user_id):
+                raise credentials_exception
+            return UserResponse(
+                id=user_id,
+                email=claims["email"],
+                username=claims["username"],
+                fullname=claims.get("fullname")
+            )
+        
+        # Recently resolved users skip the database round trip
+        cache_key = (user_id, "response")
+        if settings.user_cache_enabled:
+            cached = user_cache.get(cache_key)
+            if cached is not MISS:
+                return cached
+        generation = user_cache.generation(user_id)
             
         # Get user from database
         user = await user_crud.get_user_by_id(user_id)
@@ -37,7 +79,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
             
         # Convert to response format
         response_data = user.to_response_dict()
-        return UserResponse(**response_data)
+        current_user = UserResponse(**response_data)
+        if settings.user_cache_enabled:
+            user_cache.set(cache_key, current_user, generation)
+        return current_user
         
     except Exception as e:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+async def get_current_admin(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    """Get current user, only if their email is listed in ADMIN_EMAILS"""
+    admins = {email.lower() for email in settings.admin_emails}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
@@ -0,0 +1,44 @@
+# Bloom filter: compact set membership with false positives but no false negatives
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Sized for capacity items at roughly error_rate false positives"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: two 64-bit halves of one digest give every probe position
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str):
+        """Insert an item"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """False means definitely absent, True means probably present"""
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def stats(self) -> dict:
+        """Fill level and memory use"""
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bits": self.size,
+            "hash_count": self.hash_count,
+            "bytes": len(self._bits),
+        }
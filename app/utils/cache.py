@@ -0,0 +1,189 @@
+# In-process LRU + TTL cache with per-user invalidation
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+# Marker for "not in cache" (None is a legitimate cached value)
+MISS = object()
+
+
+class UserScopedCache:
+    """
+    LRU cache whose keys start with a user id.
+
+    Entries expire after ttl_seconds, the least recently used entries are evicted
+    beyond max_entries or max_bytes (estimated by size_of), and invalidate_user
+    drops every entry of one user in O(entries of that user).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        size_of: Callable[[Any], int] = lambda value: 256,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._by_user: Dict[Hashable, Set[Tuple]] = {}
+        # Stamped from a global clock on every invalidation so a read that raced a write is not cached.
+        # Only the most recently invalidated users are remembered, the rest share _generation_floor.
+        self._generations: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._generation_clock = 0
+        self._generation_floor = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value or MISS"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+        expires_at, _, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self, user_id: Hashable) -> int:
+        """Current invalidation generation of a user (take it before reading the database)"""
+        return self._generations.get(user_id, self._generation_floor)
+
+    def set(self, key: Tuple, value: Any, generation: int = None):
+        """Store a value, evicting least recently used entries past the limits"""
+        if generation is not None and generation != self.generation(key[0]):
+            # The user's data changed while this value was being loaded
+            return
+        if key in self._entries:
+            self._remove(key)
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+        self._by_user.setdefault(key[0], set()).add(key)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: Hashable):
+        """Drop every cached entry belonging to a user"""
+        self._generation_clock += 1
+        self._generations[user_id] = self._generation_clock
+        self._generations.move_to_end(user_id)
+        if len(self._generations) > self.max_entries:
+            self._generations.popitem(last=False)
+            # Forgotten users fall back to the floor; raising it to the clock invalidates every
+            # generation handed out before, so their in-flight reads still fail the check in set
+            self._generation_floor = self._generation_clock
+        keys = self._by_user.pop(user_id, None)
+        if not keys:
+            return
+        self.invalidations += 1
+        for key in keys:
+            _, size, _ = self._entries.pop(key)
+            self.bytes -= size
+
+    def clear(self):
+        """Drop everything"""
+        self._entries.clear()
+        self._by_user.clear()
+        self.bytes = 0
+
+    def _remove(self, key: Tuple):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+    def stats(self) -> dict:
+        """Hit rate, evictions and memory use"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "users": len(self._by_user),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class ExpiringCache:
+    """LRU cache where every entry carries its own absolute expiry (epoch seconds)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or MISS"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float):
+        """Store a value until expires_at, evicting least recently used entries past the limit"""
+        if expires_at <= time.time():
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: Hashable):
+        """Drop one entry if present"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop everything"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit rate and evictions"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
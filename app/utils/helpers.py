@@ -1,25 +1,112 @@
 # Common utility functions
-# TODO: Add your utility functions here
-# Example structure:
-
-# from datetime import datetime
-# from typing import Any, Dict
-# from bson import ObjectId
-#
-# def convert_objectid_to_str(obj: Dict[str, Any]) -> Dict[str, Any]:
-#     """Convert MongoDB ObjectId to string for JSON serialization"""
-#     if "_id" in obj and isinstance(obj["_id"], ObjectId):
-#         obj["_id"] = str(obj["_id"])
-#     return obj
-#
-# def get_current_timestamp() -> datetime:
-#     """Get current UTC timestamp"""
-#     return datetime.utcnow()
-#
-# def format_response(data: Any, message: str = "Success") -> Dict[str, Any]:
-#     """Format API response"""
-#     return {
-#         "success": True,
-#         "message": message,
-#         "data": data
-#     }
\ No newline at end of file
+import base64
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from bson import ObjectId
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _encode_payload(payload: dict) -> str:
+    """Serialize a small dict into an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_payload(token: str) -> dict:
+    """Reverse _encode_payload"""
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, object_id: ObjectId) -> str:
+    """Encode a (created_at, _id) keyset position as an opaque URL-safe cursor"""
+    return _encode_payload({"c": created_at.isoformat(), "i": str(object_id)})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode an opaque cursor back into its (created_at, _id) position"""
+    try:
+        payload = _decode_payload(cursor)
+        return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def encode_search_cursor(score: float, object_id: ObjectId) -> str:
+    """Encode a (text score, _id) keyset position as an opaque URL-safe cursor"""
+    return _encode_payload({"s": score, "i": str(object_id)})
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, ObjectId]:
+    """Decode an opaque search cursor back into its (text score, _id) position"""
+    try:
+        payload = _decode_payload(cursor)
+        return float(payload["s"]), ObjectId(payload["i"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def encode_sync_token(until: datetime) -> str:
+    """Encode the end of a sync window as an opaque token"""
+    return _encode_payload({"t": datetime_to_millis(until)})
+
+
+def decode_sync_token(token: str) -> datetime:
+    """Decode a sync token back into the end of the previous sync window"""
+    try:
+        return millis_to_datetime(int(_decode_payload(token)["t"]))
+    except Exception:
+        raise ValueError("Invalid sync token")
+
+
+def datetime_to_millis(value: datetime) -> int:
+    """Milliseconds since the epoch for a naive UTC datetime (BSON date precision)"""
+    return (value.replace(tzinfo=None) - EPOCH) // timedelta(milliseconds=1)
+
+
+def millis_to_datetime(millis: int) -> datetime:
+    """Naive UTC datetime equal to the BSON date stored for these milliseconds"""
+    return EPOCH + timedelta(milliseconds=millis)
+
+
+def _digest(*parts) -> str:
+    """Short stable hash of the given values"""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that determine a representation"""
+    return f'"{_digest(*parts)}"'
+
+
+def todo_etag(updated_at: datetime, variant: str = "") -> str:
+    """Strong ETag of a single todo: its last modification plus the representation variant"""
+    millis = datetime_to_millis(updated_at)
+    if variant:
+        return f'"{millis}-{_digest(variant)}"'
+    return f'"{millis}"'
+
+
+def parse_todo_etag(etag: str) -> Optional[datetime]:
+    """Recover the updated_at a todo ETag (full or ?fields= variant) was built from"""
+    value = etag.strip()
+    if value.startswith("W/"):
+        return None  # Weak validators never satisfy If-Match
+    # Variants only add a digest after the millis, they identify the same version of the todo
+    millis, dash, digest = value.strip('"').partition("-")
+    if not millis.isdigit() or (dash and not digest.isalnum()):
+        return None
+    return millis_to_datetime(int(millis))
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists the given ETag (weak comparison)"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
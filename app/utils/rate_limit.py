@@ -0,0 +1,153 @@
+# Token-bucket throttling of login attempts (per client IP and per account)
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Tuple
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.core.database import get_collection
+
+
+class BucketStore(ABC):
+    """Where token buckets live - subclass to share limits between workers"""
+
+    @abstractmethod
+    async def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        """
+        Refill the bucket at rate tokens per second (up to capacity) and take one token.
+
+        Returns (allowed, seconds until a token is available when not allowed).
+        """
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process buckets, the least recently used are forgotten beyond max_entries"""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class MongoBucketStore(BucketStore):
+    """Buckets in the login_buckets collection, shared by every worker (one atomic round trip per check)"""
+
+    def __init__(self):
+        self.collection_name = "login_buckets"
+
+    async def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        collection = get_collection(self.collection_name)
+        now = datetime.utcnow()
+        # A full bucket is the same as no bucket, so idle documents are left to the TTL index
+        expires_at = now + timedelta(seconds=capacity / rate)
+
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        doc = await collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [
+                        capacity,
+                        {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed_seconds, rate]}]}
+                    ]},
+                    "updated_at": now
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": expires_at
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        if doc["allowed"]:
+            return True, 0.0
+        return False, (1 - doc["tokens"]) / rate
+
+
+class LoginThrottle:
+    """Checks the client IP bucket, then the account bucket, before any password is verified"""
+
+    def __init__(self, store: BucketStore):
+        self.store = store
+        self.allowed = 0
+        self.limited_ip = 0
+        self.limited_account = 0
+        self.store_errors = 0
+
+    async def _take(self, key: str, per_minute: float, burst: int) -> Tuple[bool, float]:
+        try:
+            return await self.store.take(key, per_minute / 60, burst)
+        except Exception as e:
+            # A broken store must not lock everyone out of logging in
+            self.store_errors += 1
+            print(f"Error checking login throttle: {e}")
+            return True, 0.0
+
+    async def check(self, client_ip: str, account: str):
+        """Raise 429 with Retry-After when either bucket is empty"""
+        if not settings.login_throttle_enabled:
+            return
+
+        allowed, retry_after = await self._take(
+            f"ip:{client_ip}", settings.login_ip_per_minute, settings.login_ip_burst
+        )
+        if not allowed:
+            self.limited_ip += 1
+            raise self._too_many(retry_after)
+
+        # Normalized so "User@Example.com" and "user@example.com " share one bucket
+        allowed, retry_after = await self._take(
+            f"account:{account.strip().lower()}", settings.login_account_per_minute, settings.login_account_burst
+        )
+        if not allowed:
+            self.limited_account += 1
+            raise self._too_many(retry_after)
+
+        self.allowed += 1
+
+    def _too_many(self, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def stats(self) -> dict:
+        """Allowed and throttled attempts"""
+        return {
+            "enabled": settings.login_throttle_enabled,
+            "store": type(self.store).__name__,
+            "allowed": self.allowed,
+            "limited_ip": self.limited_ip,
+            "limited_account": self.limited_account,
+            "store_errors": self.store_errors,
+        }
+
+
+def _create_store() -> BucketStore:
+    """Bucket store selected by LOGIN_THROTTLE_STORE"""
+    if settings.login_throttle_store == "mongo":
+        return MongoBucketStore()
+    return MemoryBucketStore()
+
+# 🎯 Global login throttle used by the auth endpoints
+login_throttle = LoginThrottle(_create_store())
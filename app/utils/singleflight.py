@@ -0,0 +1,33 @@
+# Request coalescing: concurrent identical reads share one in-flight call
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, every concurrent caller gets its result"""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() once for all concurrent callers using the same key"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            # A separate task, so one caller disconnecting does not cancel the others
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Database calls made vs. calls saved by sharing"""
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
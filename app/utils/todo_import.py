@@ -0,0 +1,218 @@
+# Background import of todos from NDJSON/CSV uploads
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Iterator, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.database import get_collection
+from app.crud.todo import todo_crud
+from app.schemas.todo import TodoCreate
+
+# Job progress lives in Mongo so any worker can answer status polls (expired by a TTL index)
+IMPORT_JOBS_COLLECTION = "import_jobs"
+# Per-row errors reported back to the client
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportJob:
+    """Progress of one import"""
+
+    def __init__(self, user_id: str, file_format: str, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.user_id = user_id
+        self.format = file_format
+        self.status = "pending"
+        self.processed = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def add_error(self, row: int, message: str):
+        """Count a failed row, keeping only the first few messages"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for API responses"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "format": self.format,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+    def to_document(self) -> dict:
+        """Convert to dictionary for MongoDB storage"""
+        return {
+            "_id": self.id,
+            "user_id": self.user_id,
+            "format": self.format,
+            "status": self.status,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "ImportJob":
+        """Create ImportJob instance from MongoDB document"""
+        job = cls(doc["user_id"], doc["format"], job_id=doc["_id"])
+        job.status = doc["status"]
+        job.processed = doc.get("processed", 0)
+        job.inserted = doc.get("inserted", 0)
+        job.failed = doc.get("failed", 0)
+        job.errors = doc.get("errors", [])
+        job.created_at = doc["created_at"]
+        job.finished_at = doc.get("finished_at")
+        return job
+
+
+# Running imports of this process, referenced until they finish
+_running_tasks: Set[asyncio.Task] = set()
+
+
+async def _save(job: ImportJob):
+    """Persist job progress (a failed save never stops the import itself)"""
+    try:
+        collection = get_collection(IMPORT_JOBS_COLLECTION)
+        await collection.replace_one({"_id": job.id}, job.to_document(), upsert=True)
+    except Exception as e:
+        print(f"Error saving import job {job.id}: {e}")
+
+
+async def get_import_job(job_id: str, user_id: str) -> Optional[ImportJob]:
+    """Get a job owned by the user, whichever worker runs it"""
+    collection = get_collection(IMPORT_JOBS_COLLECTION)
+    doc = await collection.find_one({"_id": job_id, "user_id": user_id})
+    return ImportJob.from_document(doc) if doc else None
+
+
+def _read_rows(path: str, file_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, data, parse error) one line at a time"""
+    with open(path, "rb") as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.DictReader(text)
+            for row_number, row in enumerate(reader, start=2):  # Row 1 is the header
+                # Empty optional columns fall back to schema defaults
+                yield row_number, {key: value for key, value in row.items() if key and value not in (None, "")}, None
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    yield row_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(data, dict):
+                    yield row_number, None, "Expected a JSON object"
+                    continue
+                yield row_number, data, None
+
+
+def _next_rows(rows: Iterator, count: int) -> list:
+    """Read up to count rows (called in a worker thread, file reads and parsing block)"""
+    return list(itertools.islice(rows, count))
+
+
+async def _flush(job: ImportJob, batch: List[Tuple[int, TodoCreate]]):
+    """Insert a batch with one unordered insert_many"""
+    results = await todo_crud.bulk_create_todos([todo for _, todo in batch], job.user_id, ordered=False)
+    for (row_number, _), result in zip(batch, results):
+        if result["success"]:
+            job.inserted += 1
+        else:
+            job.add_error(row_number, result["error"])
+    # Progress becomes visible to other workers once per batch
+    await _save(job)
+
+
+async def _run_import(job: ImportJob, path: str):
+    """Validate rows and flush them in batches, updating job progress as it goes"""
+    job.status = "running"
+    await _save(job)
+    rows = _read_rows(path, job.format)
+    batch: List[Tuple[int, TodoCreate]] = []
+    try:
+        while True:
+            # The file is read off the event loop, one batch worth of rows at a time
+            chunk = await asyncio.to_thread(_next_rows, rows, settings.import_batch_size)
+            if not chunk:
+                break
+            for row_number, data, error in chunk:
+                job.processed += 1
+                if error:
+                    job.add_error(row_number, error)
+                    continue
+                try:
+                    batch.append((row_number, TodoCreate(**data)))
+                except ValidationError as e:
+                    job.add_error(row_number, "; ".join(err["msg"] for err in e.errors()))
+                    continue
+
+                if len(batch) >= settings.import_batch_size:
+                    await _flush(job, batch)
+                    batch = []
+
+        if batch:
+            await _flush(job, batch)
+        job.status = "completed"
+    except asyncio.CancelledError:
+        # Shutdown - the rows inserted so far stay, the job says where it stopped
+        print(f"🛑 Import {job.id} interrupted after {job.processed} row(s)")
+        job.status = "failed"
+        job.errors.append({"row": None, "error": "Interrupted by server shutdown"})
+        raise
+    except Exception as e:
+        print(f"❌ Import {job.id} failed: {e}")
+        job.status = "failed"
+        job.errors.append({"row": None, "error": str(e)})
+    finally:
+        job.finished_at = datetime.utcnow()
+        try:
+            rows.close()
+        except ValueError:
+            pass  # Still inside an abandoned worker thread read, it is closed when collected
+        os.unlink(path)
+        await _save(job)
+
+
+async def start_import(user_id: str, path: str, file_format: str) -> ImportJob:
+    """Start importing an uploaded file in the background, the job takes ownership of the file"""
+    job = ImportJob(user_id, file_format)
+    try:
+        await get_collection(IMPORT_JOBS_COLLECTION).insert_one(job.to_document())
+    except Exception:
+        os.unlink(path)
+        raise
+    task = asyncio.create_task(_run_import(job, path))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+    return job
+
+
+async def cancel_imports():
+    """Stop this process's running imports on shutdown, each job is saved as failed"""
+    tasks = list(_running_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
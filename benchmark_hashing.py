@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+⏱️ Password Hashing Benchmark
+Measure per-hash latency of candidate PASSWORD_HASH_SCHEME / PASSWORD_HASH_ROUNDS
+settings on this machine before changing them
+
+Usage: python benchmark_hashing.py --scheme bcrypt --rounds 10 11 12 13 --iterations 5
+"""
+
+import argparse
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.security import build_password_context
+
+
+def benchmark(scheme: str, rounds: int, iterations: int) -> dict:
+    """Time hash and verify for one scheme/cost combination"""
+    context = build_password_context(scheme, rounds)
+    password = "benchmark-password-123"
+
+    hash_times = []
+    verify_times = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        hashed = context.hash(password)
+        hash_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        context.verify(password, hashed)
+        verify_times.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "hash_ms": statistics.median(hash_times),
+        "verify_ms": statistics.median(verify_times),
+        "max_ms": max(hash_times + verify_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password hashing settings")
+    parser.add_argument("--scheme", nargs="+", default=[settings.password_hash_scheme],
+                        help="Schemes to try (default: the configured one)")
+    parser.add_argument("--rounds", nargs="+", type=int, default=[settings.password_hash_rounds],
+                        help="Costs to try (default: the configured one)")
+    parser.add_argument("--iterations", type=int, default=5, help="Hashes per combination")
+    args = parser.parse_args()
+
+    print(f"⏱️ Current setting: {settings.password_hash_scheme} @ {settings.password_hash_rounds} rounds")
+    print(f"{'scheme':<16}{'rounds':>8}{'hash ms':>12}{'verify ms':>12}{'logins/s/thread':>18}")
+
+    for scheme in args.scheme:
+        for rounds in args.rounds:
+            try:
+                result = benchmark(scheme, rounds, args.iterations)
+            except Exception as e:
+                print(f"❌ {scheme} @ {rounds}: {e}")
+                continue
+            per_second = 1000 / result["verify_ms"] if result["verify_ms"] else float("inf")
+            print(
+                f"{scheme:<16}{rounds:>8}{result['hash_ms']:>12.1f}"
+                f"{result['verify_ms']:>12.1f}{per_second:>18.1f}"
+            )
+
+    print(f"💡 Each login costs one verify on one of the {settings.password_hash_workers} hashing threads")
+
+
+if __name__ == "__main__":
+    main()
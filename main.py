@@ -2,29 +2,77 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.api.v1.api import api_router
-from app.core.database import connect_to_mongo, close_connection
+from app.core.database import connect_to_mongo, close_connection, warm_up_pool, get_pool_stats, get_collection
+from app.core.events import watch_todo_changes, enable_pre_images, event_bus
+from app.crud.archive import todo_archiver
+from app.crud.todo import todo_cache, todo_reads
+from app.crud.user import user_cache, user_crud
+from app.core.security import token_cache, password_hasher
+from app.core.indexes import ensure_indexes
 from app.core.config import settings
+from app.utils.rate_limit import login_throttle
+from app.crud.revoked_token import revoked_token_crud
+from app.utils.todo_import import cancel_imports
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager - handles startup/shutdown events"""
     # Startup
     print("🚀 Starting TodoApp API...")
+    background_tasks = []
+    # Each step fails on its own so one problem cannot skip the steps after it
     try:
-        # Connect to MongoDB
-        connect_to_mongo()
+        # Connect to MongoDB (async motor client)
+        await connect_to_mongo()
         print("✅ Database connected successfully")
+        # Pre-open the minimum pool before accepting traffic
+        await warm_up_pool()
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
     
+    try:
+        # Make sure every registered index exists
+        await ensure_indexes()
+    except Exception as e:
+        print(f"❌ Index reconciliation failed: {e}")
+    
+    try:
+        # Load revoked tokens before accepting traffic (until this succeeds every check reads the database)
+        await revoked_token_crud.sync()
+    except Exception as e:
+        print(f"❌ Revoked token sync failed: {e}")
+    
+    if settings.event_source == "change_stream":
+        try:
+            # Lets delete events name their owner, otherwise deletes keep being published locally
+            await enable_pre_images(get_collection("todos"))
+        except Exception as e:
+            print(f"⚠️ Could not enable change stream pre-images, publishing deletes locally: {e}")
+    
+    # Background jobs always start - they retry on their own schedule
+    background_tasks.append(asyncio.create_task(revoked_token_crud.run_forever()))
+    # Feed the todo change bus from MongoDB when configured (replica set only)
+    if settings.event_source == "change_stream":
+        background_tasks.append(asyncio.create_task(watch_todo_changes(get_collection("todos"), get_collection("todos_archive"))))
+    # Move old completed todos to the cold collection on a schedule
+    if settings.archive_enabled:
+        background_tasks.append(asyncio.create_task(todo_archiver.run_forever()))
+    
     yield  # Application runs here
     
     # Shutdown
     print("🛑 Shutting down TodoApp API...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    # Running imports record that they were interrupted while the database is still reachable
+    await cancel_imports()
     close_connection()
     print("📴 Database connection closed")
+    password_hasher.shutdown()
 
 # Create FastAPI app instance
 app = FastAPI(
@@ -59,7 +107,8 @@ async def root():
         "endpoints": {
             "authentication": "/api/v1/auth",
             "todos": "/api/v1/todos",
-            "health": "/health"
+            "health": "/health",
+            "pool": "/health/pool"
         }
     }
 
@@ -71,4 +120,44 @@ async def health():
         "app": settings.app_name,
         "version": settings.app_version,
         "environment": settings.environment
-    }
\ No newline at end of file
+    }
+
+@app.get("/health/pool")
+async def pool_health():
+    """MongoDB connection pool statistics (checked out, waiting, created)"""
+    return get_pool_stats()
+
+@app.get("/health/events")
+async def events_health():
+    """Todo change feed statistics (subscriptions, published events)"""
+    return event_bus.stats()
+
+@app.get("/health/hashing")
+async def hashing_health():
+    """Password hashing pool statistics (queue depth, rejections, bcrypt timings, upgraded hashes)"""
+    return {
+        **password_hasher.stats(),
+        "scheme": settings.password_hash_scheme,
+        "rounds": settings.password_hash_rounds,
+        "rehashed": user_crud.rehashed
+    }
+
+@app.get("/health/throttle")
+async def throttle_health():
+    """Login throttling statistics (allowed and rejected attempts)"""
+    return login_throttle.stats()
+
+@app.get("/health/revocation")
+async def revocation_health():
+    """Revoked token filter statistics (database reads avoided, false positives)"""
+    return revoked_token_crud.stats()
+
+@app.get("/health/cache")
+async def cache_health():
+    """Todo read cache, request coalescing, authenticated user and verified token cache statistics"""
+    return {
+        **todo_cache.stats(),
+        "coalescing": todo_reads.stats(),
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats()
+    }
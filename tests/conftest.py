@@ -17,3 +17,22 @@ def sample_todo():
         "description": "This is a test todo",
         "priority": PriorityLevel.LOW.value
     }
+
+@pytest.fixture
+def current_user():
+    """Authenticated user injected in place of the JWT/database lookup"""
+    from app.schemas.user import UserResponse
+    from app.utils.auth import get_current_user
+    
+    user = UserResponse(id="507f1f77bcf86cd799439011", email="user@example.com", username="testuser")
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def admin_user(current_user, monkeypatch):
+    """Authenticated user listed in ADMIN_EMAILS"""
+    from app.core.config import settings
+    
+    monkeypatch.setattr(settings, "admin_emails", [current_user.email])
+    return current_user
@@ -0,0 +1,64 @@
+# Admin endpoint tests
+import pytest
+from app.crud.archive import todo_archiver
+from app.crud.counters import counter_crud
+
+ADMIN_ROUTES = [
+    ("get", "/api/v1/admin/indexes"),
+    ("post", "/api/v1/admin/counters/rebuild"),
+    ("get", "/api/v1/admin/archive"),
+    ("post", "/api/v1/admin/archive/run"),
+]
+
+
+@pytest.mark.parametrize("method, path", ADMIN_ROUTES)
+def test_admin_routes_require_authentication(client, method, path):
+    """Anonymous requests are rejected"""
+    assert client.request(method, path).status_code == 401
+
+
+@pytest.mark.parametrize("method, path", ADMIN_ROUTES)
+def test_admin_routes_reject_regular_users(client, current_user, method, path):
+    """Users not listed in ADMIN_EMAILS get 403 before any job runs"""
+    assert client.request(method, path).status_code == 403
+
+
+def test_admin_can_read_archive_stats(client, admin_user):
+    """Archive metrics are served from memory"""
+    response = client.get("/api/v1/admin/archive")
+    assert response.status_code == 200
+    assert response.json()["runs"] == todo_archiver.runs
+
+
+def test_admin_can_read_index_report(client, admin_user, monkeypatch):
+    """The index report is returned as built"""
+    async def fake_report():
+        return {"todos": [{"name": "user_created_at", "ops": 3}]}
+    monkeypatch.setattr("app.api.v1.endpoints.admin.get_index_report", fake_report)
+
+    response = client.get("/api/v1/admin/indexes")
+    assert response.status_code == 200
+    assert response.json()["todos"][0]["name"] == "user_created_at"
+
+
+def test_admin_can_rebuild_counters(client, admin_user, monkeypatch):
+    """The rebuild job runs for every user"""
+    calls = []
+    async def fake_rebuild(user_id=None):
+        calls.append(user_id)
+    monkeypatch.setattr(counter_crud, "rebuild", fake_rebuild)
+
+    response = client.post("/api/v1/admin/counters/rebuild")
+    assert response.status_code == 200
+    assert calls == [None]
+
+
+def test_admin_can_run_archival(client, admin_user, monkeypatch):
+    """A manual run reports how many todos moved"""
+    async def fake_run_once():
+        return 4
+    monkeypatch.setattr(todo_archiver, "run_once", fake_run_once)
+
+    response = client.post("/api/v1/admin/archive/run")
+    assert response.status_code == 200
+    assert response.json()["moved"] == 4
@@ -0,0 +1,26 @@
+# Authentication endpoint tests
+from datetime import datetime, timedelta
+from app.core.security import create_access_token
+from app.crud.revoked_token import revoked_token_crud
+
+
+def test_logout_requires_authentication(client):
+    """Logging out needs the token to revoke"""
+    assert client.post("/api/v1/auth/logout").status_code == 401
+
+
+def test_logout_revokes_the_bearer_token(client, current_user, monkeypatch):
+    """The token's jti is stored until the token expires"""
+    revoked = []
+    async def fake_revoke(jti, expires_at):
+        revoked.append((jti, expires_at))
+    monkeypatch.setattr(revoked_token_crud, "revoke", fake_revoke)
+
+    token = create_access_token(current_user.id, expires_delta=timedelta(minutes=5))
+    response = client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert len(revoked) == 1
+    jti, expires_at = revoked[0]
+    assert jti
+    assert datetime.utcnow() < expires_at <= datetime.utcnow() + timedelta(minutes=5)
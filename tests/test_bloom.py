@@ -0,0 +1,34 @@
+# Bloom filter tests (revoked token ids)
+import uuid
+from app.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [uuid.uuid4().hex for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_empty_filter_contains_nothing():
+    bloom = BloomFilter(capacity=100)
+    assert "anything" not in bloom
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for _ in range(2000):
+        bloom.add(uuid.uuid4().hex)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_stats_report_size_and_items():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    bloom.add("a")
+    stats = bloom.stats()
+    assert stats["items"] == 1
+    assert stats["capacity"] == 100
+    assert stats["bytes"] * 8 >= stats["bits"]
+    assert stats["hash_count"] >= 1
@@ -0,0 +1,147 @@
+# Read cache tests (UserScopedCache, ExpiringCache)
+import time
+from typing import Tuple
+from app.utils.cache import UserScopedCache, ExpiringCache, MISS
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic / time.time"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs) -> Tuple[UserScopedCache, FakeClock]:
+    """Cache with a controllable clock"""
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    options = {"ttl_seconds": 10, "max_entries": 100, "max_bytes": 100000}
+    options.update(kwargs)
+    return UserScopedCache(**options), clock
+
+
+def test_get_returns_miss_then_cached_value(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    assert cache.get(("alice", "count")) is MISS
+    cache.set(("alice", "count"), 3)
+    assert cache.get(("alice", "count")) == 3
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_none_is_a_cacheable_value(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    cache.set(("alice", "todo", "1"), None)
+    assert cache.get(("alice", "todo", "1")) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.set(("alice", "count"), 3)
+    clock.now += 11
+    assert cache.get(("alice", "count")) is MISS
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=2)
+    cache.set(("alice", "a"), 1)
+    cache.set(("alice", "b"), 2)
+    cache.get(("alice", "a"))
+    cache.set(("alice", "c"), 3)
+    assert cache.get(("alice", "b")) is MISS
+    assert cache.get(("alice", "a")) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_evicts_and_rejects_oversized_values(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_bytes=100, size_of=lambda value: value)
+    cache.set(("alice", "a"), 60)
+    cache.set(("alice", "b"), 60)
+    assert cache.get(("alice", "a")) is MISS
+    assert cache.stats()["bytes"] == 60
+    cache.set(("alice", "huge"), 500)
+    assert cache.get(("alice", "huge")) is MISS
+
+
+def test_invalidate_user_only_drops_that_user(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    cache.set(("alice", "a"), 1)
+    cache.set(("alice", "b"), 2)
+    cache.set(("bob", "a"), 3)
+    cache.invalidate_user("alice")
+    assert cache.get(("alice", "a")) is MISS
+    assert cache.get(("alice", "b")) is MISS
+    assert cache.get(("bob", "a")) == 3
+    assert cache.stats()["users"] == 1
+
+
+def test_value_loaded_before_an_invalidation_is_not_stored(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    generation = cache.generation("alice")
+    # A write lands while the read is still in flight
+    cache.invalidate_user("alice")
+    cache.set(("alice", "list"), ["stale"], generation)
+    assert cache.get(("alice", "list")) is MISS
+    cache.set(("alice", "list"), ["fresh"], cache.generation("alice"))
+    assert cache.get(("alice", "list")) == ["fresh"]
+
+
+def test_generations_are_bounded(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=2)
+    for user in ["alice", "bob", "carol", "dave"]:
+        cache.invalidate_user(user)
+    assert len(cache._generations) == 2
+
+
+def test_forgotten_generation_still_rejects_a_stale_read(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=1)
+    generation = cache.generation("alice")
+    cache.invalidate_user("alice")
+    # bob's write pushes alice's generation out of the bounded map
+    cache.invalidate_user("bob")
+    cache.set(("alice", "list"), ["stale"], generation)
+    assert cache.get(("alice", "list")) is MISS
+    cache.set(("alice", "list"), ["fresh"], cache.generation("alice"))
+    assert cache.get(("alice", "list")) == ["fresh"]
+
+
+def test_expiring_cache_drops_entries_at_their_own_expiry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "time", clock)
+    cache = ExpiringCache(max_entries=10)
+    cache.set("short", 1, clock.now + 5)
+    cache.set("long", 2, clock.now + 60)
+    clock.now += 5
+    assert cache.get("short") is MISS
+    assert cache.get("long") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_expiring_cache_ignores_already_expired_values(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "time", clock)
+    cache = ExpiringCache(max_entries=10)
+    cache.set("token", {"sub": "1"}, clock.now - 1)
+    assert cache.get("token") is MISS
+    assert cache.stats()["entries"] == 0
+
+
+def test_expiring_cache_evicts_least_recently_used(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "time", clock)
+    cache = ExpiringCache(max_entries=2)
+    cache.set("a", 1, clock.now + 60)
+    cache.set("b", 2, clock.now + 60)
+    cache.get("a")
+    cache.set("c", 3, clock.now + 60)
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
@@ -0,0 +1,48 @@
+# Change feed publishing tests (local writes vs the change stream)
+import pytest
+from app.core import events
+from app.core.config import settings
+
+
+@pytest.fixture
+def received(monkeypatch):
+    """Events delivered to one subscriber of alice, with the change stream mode enabled"""
+    monkeypatch.setattr(settings, "event_source", "change_stream")
+    bus = events.EventBus()
+    monkeypatch.setattr(events, "event_bus", bus)
+    subscription = bus.subscribe("alice")
+    items = []
+    def drain():
+        while not subscription.queue.empty():
+            items.append(subscription.queue.get_nowait()["type"])
+        return items
+    return drain
+
+
+def test_local_writes_are_published_while_the_stream_is_down(monkeypatch, received):
+    monkeypatch.setattr(events, "change_stream_active", False)
+    events.publish_todo_event("updated", "alice", {"id": "1"})
+    assert received() == ["updated"]
+
+
+def test_active_stream_takes_over_writes(monkeypatch, received):
+    monkeypatch.setattr(events, "change_stream_active", True)
+    monkeypatch.setattr(events, "pre_images_enabled", True)
+    events.publish_todo_event("updated", "alice", {"id": "1"})
+    events.publish_todo_event("deleted", "alice", {"id": "1"})
+    assert received() == []
+
+
+def test_deletes_stay_local_without_pre_images(monkeypatch, received):
+    monkeypatch.setattr(events, "change_stream_active", True)
+    monkeypatch.setattr(events, "pre_images_enabled", False)
+    events.publish_todo_event("updated", "alice", {"id": "1"})
+    events.publish_todo_event("deleted", "alice", {"id": "1"})
+    assert received() == ["deleted"]
+
+
+def test_writes_outside_the_watched_collection_stay_local(monkeypatch, received):
+    monkeypatch.setattr(events, "change_stream_active", True)
+    monkeypatch.setattr(events, "pre_images_enabled", True)
+    events.publish_todo_event("deleted", "alice", {"id": "1"}, streamed=False)
+    assert received() == ["deleted"]
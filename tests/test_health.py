@@ -0,0 +1,24 @@
+# Health and statistics endpoint tests (no database needed)
+import pytest
+
+
+@pytest.mark.parametrize("path, key", [
+    ("/health/pool", None),
+    ("/health/events", "subscriptions"),
+    ("/health/cache", "hit_rate"),
+    ("/health/hashing", "pending"),
+    ("/health/throttle", "limited_ip"),
+    ("/health/revocation", "filter_hits"),
+])
+def test_health_endpoints(client, path, key):
+    """Statistics endpoints answer without authentication"""
+    response = client.get(path)
+    assert response.status_code == 200
+    if key is not None:
+        assert key in response.json()
+
+
+def test_cache_health_includes_every_cache(client):
+    """Todo, coalescing, user and token caches are all reported"""
+    body = client.get("/health/cache").json()
+    assert {"coalescing", "users", "tokens"} <= set(body)
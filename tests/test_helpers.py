@@ -0,0 +1,88 @@
+# Cursor, sync token and ETag helper tests
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from app.utils.helpers import (
+    encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor,
+    encode_sync_token, decode_sync_token, datetime_to_millis, millis_to_datetime,
+    make_etag, todo_etag, parse_todo_etag, etag_matches
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    object_id = ObjectId()
+    assert decode_cursor(encode_cursor(created_at, object_id)) == (created_at, object_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2024, 5, 1), ObjectId())
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", encode_search_cursor(1.5, ObjectId())])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_search_cursor_round_trip():
+    object_id = ObjectId()
+    assert decode_search_cursor(encode_search_cursor(2.75, object_id)) == (2.75, object_id)
+
+
+def test_invalid_search_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_search_cursor("not-a-cursor")
+
+
+def test_sync_token_round_trip_keeps_millisecond_precision():
+    until = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    assert decode_sync_token(encode_sync_token(until)) == datetime(2024, 5, 1, 12, 0, 0, 123000)
+
+
+def test_invalid_sync_token_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_sync_token("nope")
+
+
+def test_millis_conversion_matches_bson_precision():
+    value = datetime(2024, 1, 2, 3, 4, 5, 678901)
+    assert millis_to_datetime(datetime_to_millis(value)) == datetime(2024, 1, 2, 3, 4, 5, 678000)
+    assert datetime_to_millis(datetime(1970, 1, 1, 0, 0, 1)) == 1000
+
+
+def test_make_etag_is_stable_and_distinguishes_inputs():
+    assert make_etag("alice", 3, 100) == make_etag("alice", 3, 100)
+    assert make_etag("alice", 3, 100) != make_etag("alice", 4, 100)
+    assert make_etag("alice", 3).startswith('"') and make_etag("alice", 3).endswith('"')
+
+
+def test_todo_etag_round_trip():
+    updated_at = datetime(2024, 5, 1, 8, 0, 0, 250000)
+    assert parse_todo_etag(todo_etag(updated_at)) == updated_at
+
+
+def test_partial_representation_etag_names_the_same_version():
+    updated_at = datetime(2024, 5, 1, 8, 0, 0, 250000)
+    etag = todo_etag(updated_at, variant="name,status")
+    assert etag != todo_etag(updated_at)
+    assert parse_todo_etag(etag) == updated_at
+
+
+@pytest.mark.parametrize("header", ['W/"123"', '"abc"', "123x", '"123-"', '"123-ab/c"', '"-abc"'])
+def test_weak_or_foreign_etags_are_not_parsed(header):
+    assert parse_todo_etag(header) is None
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
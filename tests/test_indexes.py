@@ -0,0 +1,95 @@
+# Index reconciliation tests (key and TTL changes)
+import asyncio
+from types import SimpleNamespace
+from pymongo import TEXT
+from app.core import indexes
+from app.core.indexes import INDEX_REGISTRY, _same_keys, ensure_indexes
+
+
+def stored(index) -> dict:
+    """index_information entry Mongo would report for a registered index"""
+    keys = list(index.document["key"].items())
+    info = {"key": [(field, direction) for field, direction in keys if direction != TEXT]}
+    if any(direction == TEXT for _, direction in keys):
+        info["key"] += [("_fts", "text"), ("_ftsx", 1)]
+        info["weights"] = index.document["weights"]
+    if "expireAfterSeconds" in index.document:
+        info["expireAfterSeconds"] = index.document["expireAfterSeconds"]
+    return info
+
+
+class FakeCollection:
+    """Reports the registered indexes as they are and records every change"""
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.database = SimpleNamespace(command=self._command)
+        self.info = {"_id_": {"key": [("_id", 1)]}}
+        self.info.update({index.document["name"]: stored(index) for index in INDEX_REGISTRY[name]})
+
+    async def _command(self, *args, **kwargs):
+        self.calls.append(("command", args, kwargs))
+
+    async def index_information(self):
+        return dict(self.info)
+
+    async def drop_index(self, name):
+        self.calls.append(("drop", self.name, name))
+
+    async def create_indexes(self, models):
+        self.calls.append(("create", self.name, models[0].document["name"]))
+
+
+def reconcile(monkeypatch, change=None):
+    """Run ensure_indexes against fake collections, change(collections) edits them first"""
+    calls = []
+    collections = {name: FakeCollection(name, calls) for name in INDEX_REGISTRY}
+    if change is not None:
+        change(collections)
+    monkeypatch.setattr(indexes, "get_collection", lambda name: collections[name])
+    asyncio.run(ensure_indexes())
+    return calls
+
+
+def test_registered_indexes_match_their_stored_form():
+    for specs in INDEX_REGISTRY.values():
+        for index in specs:
+            assert _same_keys(stored(index), index)
+
+
+def test_ttl_index_and_plain_index_are_different():
+    index = next(index for index in INDEX_REGISTRY["todo_tombstones"] if index.document["name"] == "deleted_at_ttl")
+    info = stored(index)
+    del info["expireAfterSeconds"]
+    assert not _same_keys(info, index)
+
+
+def test_reconciled_registry_changes_nothing(monkeypatch):
+    assert reconcile(monkeypatch) == []
+
+
+def test_changed_ttl_is_applied_with_coll_mod(monkeypatch):
+    def shorten(collections):
+        collections["todo_tombstones"].info["deleted_at_ttl"]["expireAfterSeconds"] = 60
+
+    calls = reconcile(monkeypatch, shorten)
+
+    wanted = next(
+        index.document["expireAfterSeconds"]
+        for index in INDEX_REGISTRY["todo_tombstones"] if index.document["name"] == "deleted_at_ttl"
+    )
+    assert calls == [(
+        "command",
+        ("collMod", "todo_tombstones"),
+        {"index": {"name": "deleted_at_ttl", "expireAfterSeconds": wanted}}
+    )]
+
+
+def test_changed_keys_rebuild_the_index(monkeypatch):
+    def rekey(collections):
+        collections["todos"].info["user_updated_at"]["key"] = [("user_id", 1)]
+
+    calls = reconcile(monkeypatch, rekey)
+
+    assert calls == [("drop", "todos", "user_updated_at"), ("create", "todos", "user_updated_at")]
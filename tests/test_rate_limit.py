@@ -0,0 +1,123 @@
+# Login throttling tests (token buckets, Retry-After)
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.core.config import settings
+from app.utils.rate_limit import BucketStore, MemoryBucketStore, LoginThrottle
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+def take(store, key="ip:1.2.3.4", rate=1.0, capacity=3):
+    return asyncio.run(store.take(key, rate, capacity))
+
+
+def test_burst_is_allowed_then_limited(clock):
+    store = MemoryBucketStore()
+    assert [take(store)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_retry_after_is_time_until_next_token(clock):
+    store = MemoryBucketStore()
+    for _ in range(3):
+        take(store, rate=0.5)
+    allowed, retry_after = take(store, rate=0.5)
+    assert not allowed
+    assert retry_after == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    store = MemoryBucketStore()
+    for _ in range(3):
+        take(store)
+    clock.now += 1
+    assert take(store)[0] is True
+    assert take(store)[0] is False
+    clock.now += 100
+    assert [take(store)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_keys_have_separate_buckets(clock):
+    store = MemoryBucketStore()
+    for _ in range(3):
+        take(store, key="ip:a")
+    assert take(store, key="ip:a")[0] is False
+    assert take(store, key="ip:b")[0] is True
+
+
+def test_store_forgets_least_recently_used_buckets(clock):
+    store = MemoryBucketStore(max_entries=2)
+    take(store, key="a")
+    take(store, key="b")
+    take(store, key="c")
+    assert set(store._buckets) == {"b", "c"}
+
+
+def test_throttle_raises_429_with_retry_after(clock, monkeypatch):
+    monkeypatch.setattr(settings, "login_throttle_enabled", True)
+    monkeypatch.setattr(settings, "login_ip_per_minute", 60)
+    monkeypatch.setattr(settings, "login_ip_burst", 100)
+    monkeypatch.setattr(settings, "login_account_per_minute", 6)
+    monkeypatch.setattr(settings, "login_account_burst", 2)
+    throttle = LoginThrottle(MemoryBucketStore())
+
+    asyncio.run(throttle.check("1.2.3.4", "User@Example.com"))
+    asyncio.run(throttle.check("5.6.7.8", " user@example.com"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(throttle.check("9.9.9.9", "user@example.com"))
+
+    assert error.value.status_code == 429
+    # 6 per minute = one token every 10 seconds
+    assert error.value.headers["Retry-After"] == "10"
+    assert throttle.stats()["allowed"] == 2
+    assert throttle.stats()["limited_account"] == 1
+
+
+def test_throttle_checks_ip_before_account(clock, monkeypatch):
+    monkeypatch.setattr(settings, "login_throttle_enabled", True)
+    monkeypatch.setattr(settings, "login_ip_per_minute", 60)
+    monkeypatch.setattr(settings, "login_ip_burst", 1)
+    throttle = LoginThrottle(MemoryBucketStore())
+
+    asyncio.run(throttle.check("1.2.3.4", "alice"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(throttle.check("1.2.3.4", "bob"))
+
+    assert error.value.headers["Retry-After"] == "1"
+    assert throttle.stats()["limited_ip"] == 1
+
+
+def test_broken_store_fails_open(monkeypatch):
+    monkeypatch.setattr(settings, "login_throttle_enabled", True)
+
+    class BrokenStore(MemoryBucketStore):
+        async def take(self, key, rate, capacity):
+            raise RuntimeError("store unavailable")
+
+    throttle = LoginThrottle(BrokenStore())
+    asyncio.run(throttle.check("1.2.3.4", "alice"))
+    assert throttle.stats()["store_errors"] == 2
+
+
+def test_bucket_store_requires_take():
+    class Incomplete(BucketStore):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,91 @@
+# Request coalescing tests
+import asyncio
+import pytest
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_with_the_same_key_share_one_call():
+    flights = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["todo"]
+
+    async def main():
+        return await asyncio.gather(*[flights.do(("alice", "list"), load) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert results == [["todo"]] * 5
+    assert calls == 1
+    assert flights.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+def test_different_keys_do_not_share():
+    flights = SingleFlight()
+
+    async def main():
+        async def load(value):
+            await asyncio.sleep(0.01)
+            return value
+        return await asyncio.gather(
+            flights.do("a", lambda: load(1)),
+            flights.do("b", lambda: load(2)),
+        )
+
+    assert asyncio.run(main()) == [1, 2]
+    assert flights.calls == 2
+
+
+def test_key_is_released_after_completion():
+    flights = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        first = await flights.do("key", load)
+        second = await flights.do("key", load)
+        return first, second
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_errors_reach_every_waiting_caller():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database down")
+
+    async def main():
+        return await asyncio.gather(*[flights.do("key", load) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flights.do("key", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,335 @@
+# TodoCRUD behaviour tests against an in-memory stand-in for the Mongo collections
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.crud import todo as todo_module
+from app.crud.counters import counter_crud
+from app.crud.todo import todo_crud, build_projection
+from app.schemas.todo import TodoBulkUpdateItem
+
+USER = "alice"
+
+
+def matches(doc: dict, query: dict) -> bool:
+    """The subset of the query language TodoCRUD uses"""
+    for key, value in query.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in value):
+                return False
+        elif isinstance(value, dict) and "$in" in value:
+            if doc.get(key) not in value["$in"]:
+                return False
+        elif isinstance(value, dict):
+            if doc.get(key) is None:
+                return False
+            if "$gt" in value and not doc[key] > value["$gt"]:
+                return False
+            if "$lte" in value and not doc[key] <= value["$lte"]:
+                return False
+        elif doc.get(key) != value:
+            return False
+    return True
+
+
+class FakeCursor:
+    """Async cursor over a list of documents"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.docs if length is None else self.docs[:length])
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Documents in a dict; before_write runs right before each write, to simulate a concurrent writer"""
+
+    def __init__(self):
+        self.docs = {}
+        self.before_write = None
+
+    def _race(self):
+        if self.before_write is not None:
+            self.before_write(self)
+            self.before_write = None
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([dict(doc) for doc in self.docs.values() if matches(doc, query or {})])
+
+    async def find_one(self, query, projection=None):
+        return next((dict(doc) for doc in self.docs.values() if matches(doc, query)), None)
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            self.docs[doc["_id"]] = dict(doc)
+
+    async def delete_many(self, query):
+        self._race()
+        removed = [key for key, doc in self.docs.items() if matches(doc, query)]
+        for key in removed:
+            del self.docs[key]
+        return SimpleNamespace(deleted_count=len(removed))
+
+    async def bulk_write(self, operations, ordered=True):
+        self._race()
+        matched = 0
+        for operation in operations:
+            for doc in self.docs.values():
+                if matches(doc, operation._filter):
+                    doc.update(operation._doc["$set"])
+                    matched += 1
+                    break
+        return SimpleNamespace(matched_count=matched)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Collections by name, counter deltas and published events"""
+    collections = {}
+    applied = []
+    rebuilt = []
+    published = []
+
+    async def fake_apply(user_id, deltas):
+        applied.extend(deltas)
+
+    async def fake_rebuild(user_id=None):
+        rebuilt.append(user_id)
+
+    monkeypatch.setattr(todo_module, "get_collection", lambda name: collections.setdefault(name, FakeCollection()))
+    monkeypatch.setattr(counter_crud, "apply", fake_apply)
+    monkeypatch.setattr(counter_crud, "rebuild", fake_rebuild)
+    monkeypatch.setattr(
+        todo_module, "publish_todo_event",
+        lambda event_type, user_id, todo, streamed=True: published.append((event_type, todo["id"]))
+    )
+    return SimpleNamespace(
+        todos=todo_module.get_collection("todos"),
+        archive=todo_module.get_collection("todos_archive"),
+        applied=applied,
+        rebuilt=rebuilt,
+        published=published
+    )
+
+
+def add_todo(collection: FakeCollection, status: str = "NOT_STARTED", priority: str = "LOW") -> str:
+    object_id = ObjectId()
+    collection.docs[object_id] = {"_id": object_id, "user_id": USER, "name": "Todo", "status": status, "priority": priority}
+    return str(object_id)
+
+
+def test_ordered_bulk_update_stops_at_the_first_unknown_id(db):
+    first, last = add_todo(db.todos), add_todo(db.todos)
+    items = [
+        TodoBulkUpdateItem(id=first, status="COMPLETED"),
+        TodoBulkUpdateItem(id=str(ObjectId()), status="COMPLETED"),
+        TodoBulkUpdateItem(id=last, status="COMPLETED"),
+    ]
+
+    results = asyncio.run(todo_crud.bulk_update_todos(items, USER, ordered=True))
+
+    assert [result["success"] for result in results] == [True, False, False]
+    assert results[1]["error"] == "Todo not found"
+    assert results[2]["error"] == "Not attempted after an earlier failure"
+    assert db.todos.docs[ObjectId(last)]["status"] == "NOT_STARTED"
+    assert db.published == [("updated", first)]
+
+
+def test_ordered_bulk_update_stops_at_an_invalid_id(db):
+    last = add_todo(db.todos)
+    items = [TodoBulkUpdateItem(id="nope", status="COMPLETED"), TodoBulkUpdateItem(id=last, status="COMPLETED")]
+
+    results = asyncio.run(todo_crud.bulk_update_todos(items, USER, ordered=True))
+
+    assert results[0]["error"] == "Invalid todo ID"
+    assert results[1]["error"] == "Not attempted after an earlier failure"
+    assert db.todos.docs[ObjectId(last)]["status"] == "NOT_STARTED"
+
+
+def test_unordered_bulk_update_attempts_every_item(db):
+    last = add_todo(db.todos)
+    items = [TodoBulkUpdateItem(id="nope", status="COMPLETED"), TodoBulkUpdateItem(id=last, status="COMPLETED")]
+
+    results = asyncio.run(todo_crud.bulk_update_todos(items, USER))
+
+    assert [result["success"] for result in results] == [False, True]
+    assert db.todos.docs[ObjectId(last)]["status"] == "COMPLETED"
+
+
+def test_todo_deleted_during_a_bulk_update_is_not_reported_updated(db):
+    kept, gone = add_todo(db.todos), add_todo(db.todos)
+    db.todos.before_write = lambda collection: collection.docs.pop(ObjectId(gone))
+    items = [TodoBulkUpdateItem(id=kept, status="COMPLETED"), TodoBulkUpdateItem(id=gone, status="COMPLETED")]
+
+    results = asyncio.run(todo_crud.bulk_update_todos(items, USER))
+
+    assert results[0]["success"] is True
+    assert results[1] == {"index": 1, "id": gone, "success": False, "error": "Todo not found"}
+    assert db.published == [("updated", kept)]
+    # The race makes the deltas untrustworthy, the user's counters are recounted instead
+    assert db.rebuilt == [USER]
+
+
+def test_bulk_update_counts_exactly_without_a_race(db):
+    first, second = add_todo(db.todos), add_todo(db.todos, status="IN_PROGRESS", priority="HIGH")
+    items = [TodoBulkUpdateItem(id=first, status="COMPLETED"), TodoBulkUpdateItem(id=second, priority="HIGH")]
+
+    asyncio.run(todo_crud.bulk_update_todos(items, USER))
+
+    # The second item keeps its status/priority, so only the first one moves a counter
+    assert db.applied == [("NOT_STARTED", "LOW", -1), ("COMPLETED", "LOW", 1)]
+    assert db.rebuilt == []
+
+
+def test_bulk_update_skips_a_todo_changed_after_the_pre_read(db):
+    changed = add_todo(db.todos)
+    db.todos.before_write = lambda collection: collection.docs[ObjectId(changed)].update(status="IN_PROGRESS")
+
+    results = asyncio.run(todo_crud.bulk_update_todos([TodoBulkUpdateItem(id=changed, name="Renamed")], USER))
+
+    assert results[0]["error"] == "Todo was modified concurrently"
+    assert db.todos.docs[ObjectId(changed)]["name"] == "Todo"
+    assert db.published == []
+    assert db.rebuilt == [USER]
+
+
+def test_bulk_delete_counts_exactly_without_a_race(db):
+    hot, cold = add_todo(db.todos), add_todo(db.archive, status="COMPLETED")
+
+    results = asyncio.run(todo_crud.bulk_delete_todos([hot, cold, str(ObjectId())], USER))
+
+    assert [result["success"] for result in results] == [True, True, False]
+    assert not db.todos.docs and not db.archive.docs
+    assert sorted(db.applied) == [("COMPLETED", "LOW", -1), ("NOT_STARTED", "LOW", -1)]
+    assert db.rebuilt == []
+
+
+def test_bulk_delete_recounts_when_a_todo_changed_after_the_pre_read(db):
+    changed = add_todo(db.todos)
+    db.todos.before_write = lambda collection: collection.docs[ObjectId(changed)].update(status="COMPLETED")
+
+    results = asyncio.run(todo_crud.bulk_delete_todos([changed], USER))
+
+    assert results[0]["success"] is True
+    assert not db.todos.docs
+    assert db.applied == []
+    assert db.rebuilt == [USER]
+
+
+def test_counter_deltas_for_create_delete_and_move():
+    todo = {"status": "NOT_STARTED", "priority": "LOW"}
+    assert todo_crud._counter_deltas(None, todo) == [("NOT_STARTED", "LOW", 1)]
+    assert todo_crud._counter_deltas(todo, None) == [("NOT_STARTED", "LOW", -1)]
+    assert todo_crud._counter_deltas(todo, {**todo, "status": "COMPLETED"}) == [
+        ("NOT_STARTED", "LOW", -1), ("COMPLETED", "LOW", 1)
+    ]
+
+
+def test_counter_deltas_cancel_out_when_status_and_priority_stay():
+    todo = {"status": "IN_PROGRESS", "priority": "HIGH"}
+    assert todo_crud._counter_deltas(todo, {**todo, "name": "Renamed"}) == []
+
+
+def test_counter_deltas_default_missing_fields():
+    assert todo_crud._counter_deltas({}, None) == [("NOT_STARTED", "LOW", -1)]
+
+
+def test_write_errors_mark_failed_and_unattempted_items():
+    error = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}], "nMatched": 1})
+    results = [{"index": index, "success": True, "error": None} for index in range(4)]
+
+    todo_crud._apply_write_errors(error, [0, 1, 3], results, ordered=True)
+
+    assert results[0]["success"] is True
+    assert results[1] == {"index": 1, "success": False, "error": "duplicate key"}
+    # Position 2 was never part of the write
+    assert results[2]["success"] is True
+    assert results[3]["error"] == "Not attempted after an earlier failure"
+
+
+def test_unordered_write_errors_only_mark_the_failed_items():
+    error = BulkWriteError({"writeErrors": [{"index": 0, "errmsg": "boom"}]})
+    results = [{"index": index, "success": True, "error": None} for index in range(2)]
+
+    todo_crud._apply_write_errors(error, [0, 1], results, ordered=False)
+
+    assert [result["success"] for result in results] == [False, True]
+
+
+def test_projection_is_none_for_whole_documents():
+    assert build_projection(None) is None
+
+
+def test_projection_maps_id_and_adds_required_fields():
+    assert build_projection(["id", "name"], "updated_at") == {"name": 1, "updated_at": 1}
+
+
+def test_projection_of_only_id_still_projects():
+    assert build_projection(["id"]) == {"_id": 1}
+
+
+def sync_fixture(db, changed: int, deleted: int, at: datetime):
+    """changed todos and deleted tombstones of alice, all modified at the given time"""
+    for _ in range(changed):
+        object_id = ObjectId(add_todo(db.todos))
+        db.todos.docs[object_id]["updated_at"] = at
+    tombstones = todo_module.get_collection("todo_tombstones")
+    for _ in range(deleted):
+        object_id = ObjectId()
+        tombstones.docs[object_id] = {"_id": object_id, "user_id": USER, "deleted_at": at}
+
+
+def test_full_sync_returns_everything_beyond_the_cap(db):
+    now = datetime(2024, 5, 1, 12, 0)
+    sync_fixture(db, changed=5, deleted=2, at=now - timedelta(minutes=1))
+
+    changed, deleted = asyncio.run(todo_crud.get_changes(USER, None, now, max_changes=2))
+
+    # Deleted todos are simply absent from a full sync
+    assert len(changed) == 5 and deleted == []
+
+
+def test_delta_within_the_cap_lists_changes_and_deletions(db):
+    now = datetime(2024, 5, 1, 12, 0)
+    sync_fixture(db, changed=2, deleted=1, at=now - timedelta(minutes=1))
+
+    changed, deleted = asyncio.run(todo_crud.get_changes(USER, now - timedelta(hours=1), now, max_changes=3))
+
+    assert len(changed) == 2 and len(deleted) == 1
+
+
+def test_delta_over_the_cap_is_none(db):
+    now = datetime(2024, 5, 1, 12, 0)
+    sync_fixture(db, changed=2, deleted=2, at=now - timedelta(minutes=1))
+    since = now - timedelta(hours=1)
+
+    assert asyncio.run(todo_crud.get_changes(USER, since, now, max_changes=1)) is None
+    # Changes alone fit, the tombstones push it over
+    assert asyncio.run(todo_crud.get_changes(USER, since, now, max_changes=3)) is None
+
+
+def test_delta_only_covers_the_window(db):
+    now = datetime(2024, 5, 1, 12, 0)
+    sync_fixture(db, changed=1, deleted=1, at=now - timedelta(hours=2))
+
+    assert asyncio.run(todo_crud.get_changes(USER, now - timedelta(hours=1), now, max_changes=1)) == ([], [])
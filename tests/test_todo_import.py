@@ -0,0 +1,82 @@
+# Background import tests (batching, row errors, shutdown)
+import asyncio
+import os
+import tempfile
+import pytest
+from app.core.config import settings
+from app.crud.todo import todo_crud
+from app.utils import todo_import
+from app.utils.todo_import import ImportJob, cancel_imports
+
+
+class FakeJobs:
+    """import_jobs collection keeping the last saved document per job"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+    async def insert_one(self, doc):
+        self.docs[doc["_id"]] = doc
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    collection = FakeJobs()
+    monkeypatch.setattr(todo_import, "get_collection", lambda name: collection)
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    return collection
+
+
+def upload(content: bytes) -> str:
+    """Temp file the way the import endpoint hands it over"""
+    handle, path = tempfile.mkstemp(suffix=".upload")
+    with os.fdopen(handle, "wb") as file:
+        file.write(content)
+    return path
+
+
+def test_import_inserts_valid_rows_in_batches(jobs, monkeypatch):
+    batches = []
+    async def fake_bulk_create(todos, user_id, ordered=False):
+        batches.append(len(todos))
+        return [{"success": True, "error": None} for _ in todos]
+    monkeypatch.setattr(todo_crud, "bulk_create_todos", fake_bulk_create)
+
+    lines = [b'{"name": "First", "description": "a"}', b"not json", b'{"name": "Second", "description": "b"}',
+             b'{"name": "Third", "description": "c"}']
+    path = upload(b"\n".join(lines))
+    job = ImportJob("alice", "ndjson")
+    asyncio.run(todo_import._run_import(job, path))
+
+    assert batches == [2, 1]
+    saved = jobs.docs[job.id]
+    assert saved["status"] == "completed"
+    assert (saved["processed"], saved["inserted"], saved["failed"]) == (4, 3, 1)
+    assert saved["errors"][0]["row"] == 2
+    assert not os.path.exists(path)
+
+
+def test_shutdown_marks_running_imports_failed(jobs, monkeypatch):
+    async def slow_bulk_create(todos, user_id, ordered=False):
+        await asyncio.sleep(60)
+    monkeypatch.setattr(todo_crud, "bulk_create_todos", slow_bulk_create)
+
+    path = upload(b"name,description\nFirst,a\nSecond,b\n")
+
+    async def main():
+        job = await todo_import.start_import("alice", path, "csv")
+        await asyncio.sleep(0.1)
+        await cancel_imports()
+        return job
+
+    job = asyncio.run(main())
+
+    saved = jobs.docs[job.id]
+    assert saved["status"] == "failed"
+    assert saved["errors"][-1]["error"] == "Interrupted by server shutdown"
+    assert saved["finished_at"] is not None
+    assert not os.path.exists(path)
+    assert not todo_import._running_tasks